@@ -2,6 +2,14 @@
 """
 Start one or more servers, wait for them to be ready, run a command, then clean up.
 
+All servers are launched together and their readiness is checked concurrently
+against a single --timeout deadline, so a multi-server stack costs roughly the
+slowest server's boot time rather than the sum of all of them.
+
+Server output is drained continuously into a bounded in-memory buffer (and,
+with --log-dir, rotating log files); the last --dump-lines lines of each
+server are printed if startup or the command fails.
+
 Usage:
     # Single server
     python scripts/with_server.py --server "npm run dev" --port 5173 -- python automation.py
@@ -12,32 +20,981 @@ Usage:
       --server "cd backend && python server.py" --port 3000 \
       --server "cd frontend && npm run dev" --port 5173 \
       -- python test.py
+
+    # Wait for Vite to finish its startup instead of just opening the port
+    python scripts/with_server.py --server "npm run dev" --port 5173 \
+      --ready "log:ready in" -- python test.py
+
+    # Wait for an HTTP endpoint to answer 200
+    python scripts/with_server.py --server "python server.py" --port 3000 \
+      --ready "http:/health=200" -- python test.py
+
+    # Run several independent test scripts in parallel against the same servers
+    python scripts/with_server.py --server "npm run dev" --port 5173 \
+      --glob "tests/acceptance/test_*.py" --jobs 4
+
+    # Let the wrapper pick free ports; {port}/{port_N} are substituted into the
+    # server commands and WITH_SERVER_PORT_N is exported to the command(s)
+    python scripts/with_server.py \
+      --server "python server.py --port {port}" --port auto \
+      --server "BACKEND_PORT={port_1} npm run dev -- --port {port} --strictPort" --port auto \
+      -- python test.py
+
+    # Record CPU/memory of the server process trees while the tests run
+    python scripts/with_server.py --server "npm run dev" --port 5173 \
+      --sample-interval 0.5 --resource-report /tmp/dev-server-usage.csv -- python test.py
+
+    # Keep the servers warm between runs; later calls with the same
+    # --server/--port/--ready spec reuse them until idle for --idle-timeout
+    python scripts/with_server.py --daemon --server "npm run dev" --port 5173 -- python test.py
+    python scripts/with_server.py --stop-daemon --server "npm run dev" --port 5173
 """
 
 import subprocess
 import socket
+import signal
+import threading
 import time
 import sys
+import re
+import shlex
 import argparse
+import csv
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import urllib.error
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from logging.handlers import RotatingFileHandler
+
+# Readiness polling starts tight and backs off, so a probe notices a server
+# within milliseconds of it coming up without hammering a slow one.
+POLL_INITIAL = 0.01
+POLL_MAX = 0.05
+# Log probes block on the watcher's event instead of polling; they only wake
+# up this often to check for cancellation or an exited process.
+LOG_WAIT_SLICE = 0.05
+
+# Longer lines are split, which keeps a single runaway line from growing the
+# in-memory log buffer without bound.
+MAX_LINE_BYTES = 8192
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+
+
+def parse_probe(spec):
+    """Parse a --ready spec into a probe dict.
+
+    Supported forms:
+        tcp                     TCP connect succeeds (default)
+        http[:PATH][=CODES]     HTTP GET on localhost:PORT returns one of CODES
+                                (comma separated; default: any status below 400)
+        log:REGEX               REGEX matches a line of the server's output
+    """
+    if spec is None or spec == 'tcp':
+        return {'kind': 'tcp'}
+    if spec == 'http' or spec.startswith('http:'):
+        target = spec[len('http:'):] if spec.startswith('http:') else ''
+        path, _, codes = target.partition('=')
+        path = path or '/'
+        if not path.startswith('/'):
+            path = '/' + path
+        statuses = {int(code) for code in codes.split(',') if code.strip()} if codes else None
+        return {'kind': 'http', 'path': path, 'statuses': statuses}
+    if spec.startswith('log:'):
+        return {'kind': 'log', 'pattern': re.compile(spec[len('log:'):])}
+    raise ValueError(f"Unknown readiness probe: {spec!r} (expected tcp, http[:PATH][=CODES] or log:REGEX)")
+
+
+def describe_probe(probe, port):
+    if probe['kind'] == 'http':
+        return f"HTTP GET http://localhost:{port}{probe['path']}"
+    if probe['kind'] == 'log':
+        return f"log /{probe['pattern'].pattern}/"
+    return f"TCP localhost:{port}"
+
+
+class OutputWatcher:
+    """Drain a server's combined stdout/stderr in a background thread.
+
+    Reading the pipe continuously keeps a chatty server from blocking on a
+    full pipe buffer. The most recent `buffer_lines` lines are kept in a ring
+    buffer (each capped at MAX_LINE_BYTES) so memory stays constant however
+    long the run is; everything can also be mirrored to a rotating log file.
+    Lines are matched against log readiness probe patterns as they arrive.
+    """
+
+    def __init__(self, stream, patterns=(), buffer_lines=1000, log_path=None,
+                 log_max_bytes=10 * 1024 * 1024, log_backups=3):
+        self.stream = stream
+        self.patterns = [(pattern, threading.Event()) for pattern in patterns]
+        self.lines = deque(maxlen=buffer_lines)
+        self.lock = threading.Lock()
+        self.log_file = None
+        if log_path:
+            # Only the handler's rollover logic is used; lines are written
+            # straight to its stream to avoid per-line LogRecord overhead.
+            self.log_file = RotatingFileHandler(log_path, maxBytes=log_max_bytes,
+                                                backupCount=log_backups, encoding='utf-8')
+            self.log_bytes = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
 
-def is_server_ready(port, timeout=30):
-    """Wait for server to be ready by polling the port."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    def _run(self):
         try:
-            with socket.create_connection(('localhost', port), timeout=1):
-                return True
-        except (socket.error, ConnectionRefusedError):
-            time.sleep(0.5)
+            for raw in iter(lambda: self.stream.readline(MAX_LINE_BYTES), b''):
+                line = ANSI_ESCAPE.sub('', raw.decode('utf-8', errors='replace'))
+                if not line.endswith('\n'):
+                    line += '\n'
+                with self.lock:
+                    self.lines.append(line)
+                if self.log_file is not None:
+                    self._write_log(line)
+                for pattern, event in self.patterns:
+                    if not event.is_set() and pattern.search(line):
+                        event.set()
+        finally:
+            self.stream.close()
+            if self.log_file is not None:
+                self.log_file.close()
+
+    def _write_log(self, line):
+        self.log_file.stream.write(line)
+        self.log_file.stream.flush()
+        self.log_bytes += len(line)
+        if self.log_file.maxBytes and self.log_bytes >= self.log_file.maxBytes:
+            self.log_file.doRollover()
+            self.log_bytes = 0
+
+    def event(self, pattern):
+        """The threading.Event set when `pattern` first matches, or None."""
+        for candidate, event in self.patterns:
+            if candidate is pattern:
+                return event
+        return None
+
+    def matched(self, pattern):
+        event = self.event(pattern)
+        return event is not None and event.is_set()
+
+    def tail(self, n):
+        """Return the last `n` buffered lines."""
+        with self.lock:
+            return list(self.lines)[-n:] if n > 0 else []
+
+
+def print_server_tail(i, server, lines):
+    print(f"\n--- Last {len(lines)} line(s) of server {i+1} output ({server['cmd']}) ---")
+    print(''.join(lines), end='')
+    print(f"--- End of server {i+1} output ---")
+
+
+def dump_server_logs(servers, watchers, n):
+    """Print the last `n` lines of every server's output (used on failure)."""
+    for i, watcher in enumerate(watchers):
+        print_server_tail(i, servers[i], watcher.tail(n))
+
+
+def dump_server_log_files(servers, log_dir, n):
+    """Like dump_server_logs, for servers owned by a daemon (read from its log files)."""
+    for i, server in enumerate(servers):
+        print_server_tail(i, server, tail_file(os.path.join(log_dir, f'server-{i+1}.log'), n))
+
+
+def probe_once(probe, port, watcher=None):
+    """Run a single readiness check; True if the server looks ready."""
+    if probe['kind'] == 'log':
+        return watcher is not None and watcher.matched(probe['pattern'])
+    if probe['kind'] == 'http':
+        url = f"http://localhost:{port}{probe['path']}"
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (urllib.error.URLError, socket.error):
+            return False
+        if probe['statuses'] is None:
+            return status < 400
+        return status in probe['statuses']
+    try:
+        with socket.create_connection(('localhost', port), timeout=1):
+            return True
+    except (socket.error, ConnectionRefusedError):
+        return False
+
+
+def is_server_ready(port, timeout=30, process=None, cancel=None, probe=None, watcher=None):
+    """Wait for server to be ready by polling `probe` (TCP connect by default).
+
+    Polls every POLL_INITIAL seconds at first, doubling up to POLL_MAX. Log
+    probes wait on the watcher's event instead, so they return as soon as
+    the line is read. Gives up early if `process` exits or the `cancel`
+    event is set.
+    """
+    probe = probe or {'kind': 'tcp'}
+    deadline = time.time() + timeout
+    if probe['kind'] == 'log':
+        return wait_for_log(probe, watcher, deadline, process, cancel)
+    delay = POLL_INITIAL
+    while time.time() < deadline:
+        if cancel is not None and cancel.is_set():
+            return False
+        if process is not None and process.poll() is not None:
+            return False
+        if probe_once(probe, port, watcher):
+            return True
+        pause = min(delay, max(deadline - time.time(), 0))
+        if cancel is not None:
+            cancel.wait(pause)
+        else:
+            time.sleep(pause)
+        delay = min(delay * 2, POLL_MAX)
     return False
 
 
+def wait_for_log(probe, watcher, deadline, process=None, cancel=None):
+    """Block on the log probe's match event until `deadline`."""
+    event = watcher.event(probe['pattern']) if watcher is not None else None
+    if event is None:
+        return False
+    while True:
+        if event.is_set():
+            return True
+        if cancel is not None and cancel.is_set():
+            return False
+        if process is not None and process.poll() is not None:
+            # The line may have been the last thing it printed
+            return event.is_set()
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return False
+        if event.wait(min(remaining, LOG_WAIT_SLICE)):
+            return True
+
+
+def wait_for_servers(servers, processes, timeout, watchers=None):
+    """Wait for all servers concurrently against a single overall deadline.
+
+    Returns a list of seconds-until-ready per server (relative to the call).
+    Raises RuntimeError naming the first server that failed; the remaining
+    checks are cancelled as soon as one fails.
+    """
+    start = time.time()
+    deadline = start + timeout
+    cancel = threading.Event()
+    ready_at = [None] * len(servers)
+
+    def check(i):
+        server = servers[i]
+        ok = is_server_ready(server['port'], timeout=deadline - time.time(),
+                             process=processes[i], cancel=cancel,
+                             probe=server['probe'], watcher=watchers[i] if watchers else None)
+        if ok:
+            ready_at[i] = time.time() - start
+            print(f"Server {i+1} ready on port {server['port']} (+{ready_at[i]:.2f}s)")
+        return i, ok
+
+    with ThreadPoolExecutor(max_workers=len(servers)) as pool:
+        futures = [pool.submit(check, i) for i in range(len(servers))]
+        for future in as_completed(futures):
+            i, ok = future.result()
+            if ok:
+                continue
+            # First failure wins: stop the other checks and report it
+            cancel.set()
+            port = servers[i]['port']
+            code = processes[i].poll()
+            if code is not None:
+                raise RuntimeError(f"Server {i+1} exited with code {code} before port {port} was ready")
+            probe = describe_probe(servers[i]['probe'], port)
+            raise RuntimeError(f"Server {i+1} not ready ({probe}) within {timeout}s")
+
+    return ready_at
+
+
+def parse_port(value):
+    """argparse type for --port: a port number, or 'auto' (also 0) for a free port."""
+    if value == 'auto':
+        return 0
+    port = int(value)
+    if not 0 <= port <= 65535:
+        raise argparse.ArgumentTypeError(f"invalid port: {value}")
+    return port
+
+
+def allocate_port():
+    """Ask the OS for a currently free TCP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def port_in_use(port):
+    try:
+        with socket.create_connection(('localhost', port), timeout=0.2):
+            return True
+    except (socket.error, ConnectionRefusedError):
+        return False
+
+
+def assign_ports(servers):
+    """Resolve --port auto to free ports and fill {port}/{port_N} in server commands.
+
+    {port} is the server's own port and {port_N} the port of the N-th server
+    (1-based), so a frontend can be pointed at an auto-assigned backend.
+    Raises RuntimeError if a fixed port is already taken, which usually means
+    a server leaked from an earlier run would otherwise answer our probes.
+    """
+    for server in servers:
+        if server['port_spec'] == 0:
+            server['port'] = allocate_port()
+        else:
+            server['port'] = server['port_spec']
+            if port_in_use(server['port']):
+                raise RuntimeError(f"Port {server['port']} is already in use (leftover server from an earlier run?); "
+                                   f"stop it or use --port auto")
+    for server in servers:
+        cmd = server['cmd_template'].replace('{port}', str(server['port']))
+        for n, other in enumerate(servers, start=1):
+            cmd = cmd.replace(f'{{port_{n}}}', str(other['port']))
+        server['cmd'] = cmd
+
+
+def export_ports(ports):
+    """Expose server ports to the command(s) (and servers started later) via the environment."""
+    for n, port in enumerate(ports, start=1):
+        os.environ[f'WITH_SERVER_PORT_{n}'] = str(port)
+    if ports:
+        os.environ['WITH_SERVER_PORT'] = str(ports[0])
+    print(f"Ports: {', '.join(f'WITH_SERVER_PORT_{n}={port}' for n, port in enumerate(ports, start=1))}")
+
+
+def child_pids():
+    """Map of parent pid -> child pids, read from /proc (empty where unavailable)."""
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return children
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state, ppid, ...
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(pid, children=None):
+    """Return `pid` and all of its descendants (`children` from child_pids())."""
+    if children is None:
+        children = child_pids()
+    tree = [pid]
+    i = 0
+    while i < len(tree):
+        tree.extend(children.get(tree[i], []))
+        i += 1
+    return tree
+
+
+def process_running(pid):
+    """True if `pid` exists and is not a zombie."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            stat = f.read()
+        return stat[stat.rindex(')') + 2] != 'Z'
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return pid_alive(pid)
+
+
+def signal_group(pgid, sig):
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def start_servers(servers, args, log_dir=None):
+    """Launch every server at once; returns (processes, watchers).
+
+    Each server gets its own session/process group, so teardown can signal
+    the shell and everything it spawned (npm -> node -> esbuild, ...).
+    """
+    processes = []
+    watchers = []
+    for i, server in enumerate(servers):
+        print(f"Starting server {i+1}/{len(servers)}: {server['cmd']}")
+
+        # Use shell=True to support commands with cd and &&
+        process = subprocess.Popen(
+            server['cmd'],
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        processes.append(process)
+        log_patterns = [server['probe']['pattern']] if server['probe']['kind'] == 'log' else []
+        log_path = os.path.join(log_dir, f'server-{i+1}.log') if log_dir else None
+        watchers.append(OutputWatcher(process.stdout, log_patterns, buffer_lines=args.log_lines,
+                                      log_path=log_path, log_max_bytes=args.log_max_bytes,
+                                      log_backups=args.log_backups))
+    return processes, watchers
+
+
+def stop_servers(processes, ports=()):
+    """Stop each server's whole process group, then hunt down orphans.
+
+    The process tree is recorded before signalling; any member still running
+    afterwards (e.g. a child that moved to its own session) is reported and
+    killed. Ports still accepting connections after teardown are reported too.
+    """
+    print(f"\nStopping {len(processes)} server(s)...")
+    for i, process in enumerate(processes):
+        tree = process_tree(process.pid)
+        signal_group(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            signal_group(process.pid, signal.SIGKILL)
+            process.wait()
+        # Give the rest of the group a moment to follow the leader out
+        deadline = time.time() + 2
+        while time.time() < deadline and any(process_running(pid) for pid in tree[1:]):
+            time.sleep(0.05)
+        signal_group(process.pid, signal.SIGKILL)
+        orphans = [pid for pid in tree[1:] if process_running(pid)]
+        for pid in orphans:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        if orphans:
+            print(f"Server {i+1} stopped (killed {len(orphans)} orphaned process(es): {', '.join(map(str, orphans))})")
+        else:
+            print(f"Server {i+1} stopped")
+    for port in ports:
+        if port_in_use(port):
+            print(f"Warning: port {port} is still accepting connections after teardown")
+    print("All servers stopped")
+
+
+def tail_file(path, n, chunk_size=64 * 1024):
+    """Return the last `n` lines of a (possibly large) text file."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(size - chunk_size, 0))
+            data = f.read()
+    except OSError:
+        return []
+    lines = data.decode('utf-8', errors='replace').splitlines(keepends=True)
+    return lines[-n:] if n > 0 else []
+
+
+class ResourceSampler:
+    """Sample CPU, RSS, open fds and threads of each server's process tree.
+
+    Reads /proc directly (Linux only, no extra dependencies) every `interval`
+    seconds in a background thread. Values are summed over the server's
+    whole process tree; CPU% is relative to one core.
+    """
+
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    METRICS = ('cpu_percent', 'rss_bytes', 'open_fds', 'threads')
+
+    def __init__(self, servers, pids, interval=1.0):
+        self.servers = servers
+        self.pids = pids
+        self.interval = interval
+        self.samples = []
+        self.cpu_ticks = {}
+        self.last_sample = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def available():
+        return os.path.isdir('/proc/self/fd')
+
+    def start(self):
+        self.start_time = time.time()
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+
+    def _run(self):
+        self._sample()
+        while not self.stop_event.wait(self.interval):
+            self._sample()
+
+    def _read_pid(self, pid):
+        """Return (cpu_ticks, rss_bytes, open_fds, threads) for one pid, or None if gone."""
+        try:
+            with open(f'/proc/{pid}/stat') as f:
+                stat = f.read()
+            with open(f'/proc/{pid}/statm') as f:
+                rss_pages = int(f.read().split()[1])
+            fields = stat[stat.rindex(')') + 2:].split()
+            try:
+                fds = len(os.listdir(f'/proc/{pid}/fd'))
+            except PermissionError:
+                fds = 0
+        except (OSError, ValueError, IndexError):
+            return None
+        # utime, stime and num_threads are fields 14, 15 and 20 of /proc/PID/stat
+        ticks = int(fields[11]) + int(fields[12])
+        return ticks, rss_pages * self.PAGE_SIZE, fds, int(fields[17])
+
+    def _sample(self):
+        now = time.time()
+        elapsed = now - self.last_sample if self.last_sample else None
+        self.last_sample = now
+        children = child_pids()
+        cpu_ticks = {}
+        for i, root in enumerate(self.pids):
+            tree = process_tree(root, children)
+            row = {'t': round(now - self.start_time, 3), 'server': i + 1, 'processes': 0,
+                   'cpu_percent': 0.0, 'rss_bytes': 0, 'open_fds': 0, 'threads': 0}
+            delta_ticks = 0
+            for pid in tree:
+                values = self._read_pid(pid)
+                if values is None:
+                    continue
+                ticks, rss, fds, threads = values
+                cpu_ticks[pid] = ticks
+                # Processes seen for the first time only count from the next sample
+                if pid in self.cpu_ticks:
+                    delta_ticks += ticks - self.cpu_ticks[pid]
+                row['processes'] += 1
+                row['rss_bytes'] += rss
+                row['open_fds'] += fds
+                row['threads'] += threads
+            if elapsed:
+                row['cpu_percent'] = round(100.0 * delta_ticks / self.CLOCK_TICKS / elapsed, 1)
+            self.samples.append(row)
+        self.cpu_ticks = cpu_ticks
+
+    def summary(self):
+        """Peak and mean of every metric, per server."""
+        result = []
+        for i, server in enumerate(self.servers):
+            rows = [row for row in self.samples if row['server'] == i + 1]
+            # The first sample has no CPU delta yet
+            cpu_rows = rows[1:] or rows
+            stats = {}
+            for metric in self.METRICS:
+                values = [row[metric] for row in (cpu_rows if metric == 'cpu_percent' else rows)]
+                stats[metric] = {
+                    'peak': max(values) if values else 0,
+                    'mean': round(sum(values) / len(values), 1) if values else 0,
+                }
+            result.append({'server': i + 1, 'cmd': server['cmd'], 'port': server['port'],
+                           'samples': len(rows), **stats})
+        return result
+
+    def report(self, path=None):
+        """Print the summary and optionally write the series to `path` (.json or .csv)."""
+        summary = self.summary()
+        print(f"\nResource usage ({len(self.samples)} sample(s) every {self.interval}s):")
+        for entry in summary:
+            print(f"  Server {entry['server']} (port {entry['port']}): "
+                  f"CPU peak {entry['cpu_percent']['peak']:.1f}% mean {entry['cpu_percent']['mean']:.1f}%, "
+                  f"RSS peak {entry['rss_bytes']['peak'] / 2**20:.1f} MiB mean {entry['rss_bytes']['mean'] / 2**20:.1f} MiB, "
+                  f"fds peak {entry['open_fds']['peak']}, threads peak {entry['threads']['peak']}")
+        if not path:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=['t', 'server', 'processes', *self.METRICS])
+                writer.writeheader()
+                writer.writerows(self.samples)
+            summary_path = os.path.splitext(path)[0] + '.summary.json'
+            with open(summary_path, 'w') as f:
+                json.dump({'interval': self.interval, 'servers': summary}, f, indent=2)
+            print(f"Resource samples written to {path} (summary: {summary_path})")
+        else:
+            with open(path, 'w') as f:
+                json.dump({'interval': self.interval, 'servers': summary, 'samples': self.samples}, f, indent=2)
+            print(f"Resource samples written to {path}")
+
+
+def sample_resources(args, servers, pids):
+    """Start a ResourceSampler if --sample-interval is set; returns it or None."""
+    if not args.sample_interval:
+        return None
+    if not ResourceSampler.available():
+        print("Warning: resource sampling needs /proc; skipping")
+        return None
+    return ResourceSampler(servers, pids, args.sample_interval).start()
+
+
+def finish_sampling(sampler, args):
+    if sampler is not None:
+        sampler.stop()
+        sampler.report(args.resource_report)
+
+
+def collect_commands(args):
+    """Build the list of commands to run from --cmd, --glob and the trailing command."""
+    commands = []
+    for cmd in args.cmds or []:
+        commands.append({'label': cmd, 'cmd': cmd, 'shell': True})
+    for pattern in args.globs or []:
+        paths = sorted(glob.glob(pattern, recursive=True))
+        if not paths:
+            raise ValueError(f"--glob {pattern!r} matched no files")
+        for path in paths:
+            cmd = args.runner.replace('{}', shlex.quote(path))
+            commands.append({'label': cmd, 'cmd': cmd, 'shell': True})
+    if args.command:
+        commands.append({'label': ' '.join(args.command), 'cmd': args.command, 'shell': False})
+    return commands
+
+
+def run_commands(commands, jobs):
+    """Run commands against the ready servers; returns the combined exit code.
+
+    A single command runs in the foreground with its output streamed as
+    before. Several commands are run on a pool of `jobs` workers with each
+    command's output captured and printed as one block when it finishes,
+    followed by a pass/fail and wall-clock summary. The combined exit code
+    is 0 if every command passed, otherwise the first failing command's code
+    (in the order the commands were given).
+    """
+    if len(commands) == 1:
+        print(f"Running: {commands[0]['label']}\n")
+        return subprocess.run(commands[0]['cmd'], shell=commands[0]['shell']).returncode
+
+    jobs = max(1, min(jobs, len(commands)))
+    print(f"Running {len(commands)} command(s) on {jobs} worker(s)\n")
+    print_lock = threading.Lock()
+    results = [None] * len(commands)
+
+    def run(i):
+        command = commands[i]
+        start = time.time()
+        result = subprocess.run(command['cmd'], shell=command['shell'], stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        elapsed = time.time() - start
+        results[i] = (result.returncode, elapsed)
+        status = 'PASS' if result.returncode == 0 else f'FAIL ({result.returncode})'
+        with print_lock:
+            print(f"===== [{i+1}/{len(commands)}] {status} in {elapsed:.2f}s: {command['label']} =====")
+            print(result.stdout.decode('utf-8', errors='replace'), end='')
+            print(f"===== end of [{i+1}/{len(commands)}] =====\n")
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(run, range(len(commands))))
+    wall = time.time() - start
+
+    failed = [i for i, (code, _) in enumerate(results) if code != 0]
+    serial = sum(elapsed for _, elapsed in results)
+    print(f"Summary: {len(commands)} command(s), {len(commands) - len(failed)} passed, {len(failed)} failed")
+    for i, command in enumerate(commands):
+        code, elapsed = results[i]
+        status = 'PASS' if code == 0 else 'FAIL'
+        print(f"  {status}  {elapsed:8.2f}s  {command['label']}")
+    speedup = serial / wall if wall > 0 else 1.0
+    print(f"Wall clock {wall:.2f}s (sum of commands {serial:.2f}s, {speedup:.1f}x with {jobs} worker(s))")
+    return results[failed[0]][0] if failed else 0
+
+
+# --- Daemon mode ---------------------------------------------------------
+#
+# The first --daemon invocation for a given server spec spawns a detached
+# supervisor (this script re-run with --supervise) that owns the servers and
+# records them in <state-dir>/<spec-hash>/state.json. Every invocation holds
+# a lease file for its pid while its command runs; the supervisor shuts the
+# servers down once no lease has been held for --idle-timeout seconds. A
+# flock on <spec-dir>/lock serialises attach, startup and idle shutdown.
+
+def default_state_dir():
+    return os.path.join(tempfile.gettempdir(), f'with_server-{os.getuid()}')
+
+
+def spec_dir(args, servers):
+    """Per-spec state directory; the same servers, ports and cwd share one."""
+    spec = {
+        'cwd': os.getcwd(),
+        'servers': [[server['cmd_template'], server['port_spec'], server['ready']] for server in servers],
+    }
+    key = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+    path = os.path.join(args.state_dir or default_state_dir(), key)
+    os.makedirs(os.path.join(path, 'leases'), exist_ok=True)
+    return path
+
+
+@contextmanager
+def file_lock(path, blocking=True):
+    """Hold an exclusive flock on `path`; yields False if non-blocking and busy."""
+    with open(path, 'a') as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_state(directory):
+    try:
+        with open(os.path.join(directory, 'state.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_state(directory, state):
+    path = os.path.join(directory, 'state.json')
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def remove_state(directory):
+    try:
+        os.remove(os.path.join(directory, 'state.json'))
+    except FileNotFoundError:
+        pass
+
+
+def live_leases(directory):
+    """Return pids holding a lease, pruning leases of processes that are gone."""
+    pids = []
+    lease_dir = os.path.join(directory, 'leases')
+    for name in os.listdir(lease_dir):
+        if not name.isdigit():
+            continue
+        if pid_alive(int(name)):
+            pids.append(int(name))
+        else:
+            try:
+                os.remove(os.path.join(lease_dir, name))
+            except FileNotFoundError:
+                pass
+    return pids
+
+
+def supervise(args, servers, directory):
+    """Run as the detached daemon: own the servers until idle or told to stop."""
+    log_dir = args.log_dir or os.path.join(directory, 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    try:
+        assign_ports(servers)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        write_state(directory, {'status': 'failed', 'pid': os.getpid(), 'error': str(e)})
+        return 1
+    export_ports([server['port'] for server in servers])
+
+    processes, watchers = start_servers(servers, args, log_dir)
+    write_state(directory, {'status': 'starting', 'pid': os.getpid()})
+    ports = [server['port'] for server in servers]
+    try:
+        try:
+            ready_at = wait_for_servers(servers, processes, args.timeout, watchers)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            write_state(directory, {'status': 'failed', 'pid': os.getpid(), 'error': str(e)})
+            return 1
+
+        write_state(directory, {
+            'status': 'ready',
+            'pid': os.getpid(),
+            'started': time.time(),
+            'log_dir': log_dir,
+            'servers': [
+                {'cmd': server['cmd'], 'port': server['port'], 'pid': process.pid, 'ready_after': ready}
+                for server, process, ready in zip(servers, processes, ready_at)
+            ],
+        })
+        print(f"All {len(servers)} server(s) ready; idle timeout {args.idle_timeout}s")
+
+        idle_since = time.time()
+        while not stop.wait(1):
+            dead = [i for i, process in enumerate(processes) if process.poll() is not None]
+            if dead:
+                print(f"Server(s) {', '.join(str(i + 1) for i in dead)} exited; shutting down")
+                break
+            if live_leases(directory):
+                idle_since = time.time()
+                continue
+            if time.time() - idle_since < args.idle_timeout:
+                continue
+            # Hold the lock through teardown so no client attaches to servers
+            # that are about to go away, or starts new ones on busy ports.
+            with file_lock(os.path.join(directory, 'lock'), blocking=False) as locked:
+                if not locked or live_leases(directory):
+                    continue
+                print(f"Idle for {args.idle_timeout}s; shutting down")
+                remove_state(directory)
+                stop_servers(processes, ports)
+                return 0
+        with file_lock(os.path.join(directory, 'lock')):
+            remove_state(directory)
+            stop_servers(processes, ports)
+        return 0
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                signal_group(process.pid, signal.SIGKILL)
+        state = read_state(directory)
+        if state and state.get('pid') == os.getpid() and state.get('status') != 'failed':
+            remove_state(directory)
+
+
+def spawn_supervisor(directory, timeout):
+    """Start a detached supervisor and wait for its servers; returns its state."""
+    remove_state(directory)
+    with open(os.path.join(directory, 'supervisor.log'), 'ab') as log:
+        supervisor = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--supervise'] + sys.argv[1:],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+    deadline = time.time() + timeout + 5
+    delay = POLL_INITIAL
+    while time.time() < deadline:
+        state = read_state(directory)
+        if state and state.get('pid') == supervisor.pid and state['status'] in ('ready', 'failed'):
+            return state
+        if supervisor.poll() is not None:
+            return {'status': 'failed', 'error': f"supervisor exited with code {supervisor.returncode}"}
+        time.sleep(delay)
+        delay = min(delay * 2, POLL_MAX)
+    supervisor.terminate()
+    return {'status': 'failed', 'error': f"servers not ready within {timeout}s"}
+
+
+def attach_daemon(args, servers, directory):
+    """Reuse the warm servers for this spec (starting them if needed) and take a lease."""
+    with file_lock(os.path.join(directory, 'lock')):
+        state = read_state(directory)
+        if state and state.get('status') == 'ready' and pid_alive(state['pid']):
+            age = time.time() - state['started']
+            print(f"Reusing {len(servers)} warm server(s) from daemon pid {state['pid']} (up {age:.0f}s)")
+        else:
+            print(f"Starting daemon for {len(servers)} server(s) (state: {directory})")
+            start = time.time()
+            state = spawn_supervisor(directory, args.timeout)
+            if state['status'] != 'ready':
+                print(f"Error: daemon failed to start: {state.get('error')}")
+                log_dir = args.log_dir or os.path.join(directory, 'logs')
+                dump_server_log_files(servers, log_dir, args.dump_lines)
+                return None
+            print(f"All {len(servers)} server(s) ready in {time.time() - start:.2f}s")
+        lease = os.path.join(directory, 'leases', str(os.getpid()))
+        open(lease, 'w').close()
+    return state
+
+
+def release_daemon(directory):
+    try:
+        os.remove(os.path.join(directory, 'leases', str(os.getpid())))
+    except FileNotFoundError:
+        pass
+
+
+def stop_daemon(directory):
+    """Stop the daemon for this spec, if one is running."""
+    state = read_state(directory)
+    if not state or not pid_alive(state.get('pid', 0)):
+        print("No daemon running for these servers")
+        return 0
+    os.kill(state['pid'], signal.SIGTERM)
+    deadline = time.time() + 15
+    while pid_alive(state['pid']) and time.time() < deadline:
+        time.sleep(0.1)
+    if pid_alive(state['pid']):
+        print(f"Error: daemon pid {state['pid']} did not stop")
+        return 1
+    print(f"Stopped daemon pid {state['pid']}")
+    return 0
+
+
+def run_with_daemon(args, servers, directory, commands):
+    state = attach_daemon(args, servers, directory)
+    if state is None:
+        return 1
+    export_ports([server['port'] for server in state['servers']])
+    sampler = sample_resources(args, state['servers'], [server['pid'] for server in state['servers']])
+    try:
+        returncode = run_commands(commands, args.jobs)
+    finally:
+        release_daemon(directory)
+        finish_sampling(sampler, args)
+    if returncode != 0:
+        dump_server_log_files(servers, state['log_dir'], args.dump_lines)
+    return returncode
+
+
 def main():
     parser = argparse.ArgumentParser(description='Run command with one or more servers')
     parser.add_argument('--server', action='append', dest='servers', required=True, help='Server command (can be repeated)')
-    parser.add_argument('--port', action='append', dest='ports', type=int, required=True, help='Port for each server (must match --server count)')
-    parser.add_argument('--timeout', type=int, default=30, help='Timeout in seconds per server (default: 30)')
-    parser.add_argument('command', nargs=argparse.REMAINDER, help='Command to run after server(s) ready')
+    parser.add_argument('--port', action='append', dest='ports', type=parse_port, required=True, help='Port for each server (must match --server count); "auto" picks a free port')
+    parser.add_argument('--ready', action='append', dest='probes', help='Readiness probe for each server: tcp (default), http[:PATH][=CODES] or log:REGEX')
+    parser.add_argument('--timeout', type=int, default=30, help='Overall timeout in seconds for all servers to become ready (default: 30)')
+    parser.add_argument('--log-lines', type=int, default=1000, help='Lines of output kept in memory per server (default: 1000)')
+    parser.add_argument('--dump-lines', type=int, default=50, help='Lines of each server\'s output printed on failure (default: 50)')
+    parser.add_argument('--log-dir', help='Also write each server\'s output to DIR/server-N.log (rotated)')
+    parser.add_argument('--log-max-bytes', type=int, default=10 * 1024 * 1024, help='Rotate server log files at this size (default: 10 MiB)')
+    parser.add_argument('--log-backups', type=int, default=3, help='Rotated server log files to keep (default: 3)')
+    parser.add_argument('--cmd', action='append', dest='cmds', help='Shell command to run against the servers (can be repeated)')
+    parser.add_argument('--glob', action='append', dest='globs', help='Run --runner once per file matching this pattern (can be repeated)')
+    parser.add_argument('--runner', default=f'{shlex.quote(sys.executable)} {{}}', help='Command template for --glob matches; {} is replaced by the path (default: python {})')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help='Commands to run in parallel (default: CPU count)')
+    parser.add_argument('--sample-interval', type=float, default=0, help='Sample CPU/RSS/fds/threads of each server\'s process tree every N seconds while the command runs')
+    parser.add_argument('--resource-report', help='Write the resource samples and peak/mean summary to this .json or .csv file')
+    parser.add_argument('--daemon', action='store_true', help='Keep the servers running after the command and reuse them on later calls with the same servers')
+    parser.add_argument('--idle-timeout', type=int, default=600, help='Daemon mode: stop the servers after this many idle seconds (default: 600)')
+    parser.add_argument('--stop-daemon', action='store_true', help='Stop the daemon for these servers and exit')
+    parser.add_argument('--state-dir', help='Daemon mode: state directory (default: $TMPDIR/with_server-UID)')
+    parser.add_argument('--supervise', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('command', nargs=argparse.REMAINDER, help='Command to run after server(s) ready (optional with --cmd/--glob)')
 
     args = parser.parse_args()
 
@@ -45,7 +1002,13 @@ def main():
     if args.command and args.command[0] == '--':
         args.command = args.command[1:]
 
-    if not args.command:
+    try:
+        commands = collect_commands(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not commands and not (args.supervise or args.stop_daemon):
         print("Error: No command specified to run")
         sys.exit(1)
 
@@ -54,53 +1017,70 @@ def main():
         print("Error: Number of --server and --port arguments must match")
         sys.exit(1)
 
+    if args.probes and len(args.probes) != len(args.servers):
+        print("Error: Number of --ready and --server arguments must match")
+        sys.exit(1)
+
+    probes = args.probes or [None] * len(args.servers)
     servers = []
-    for cmd, port in zip(args.servers, args.ports):
-        servers.append({'cmd': cmd, 'port': port})
+    for cmd, port, spec in zip(args.servers, args.ports, probes):
+        try:
+            probe = parse_probe(spec)
+        except (ValueError, re.error) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        servers.append({'cmd_template': cmd, 'cmd': cmd, 'port_spec': port, 'port': port,
+                        'ready': spec or 'tcp', 'probe': probe})
+
+    if args.supervise or args.stop_daemon or args.daemon:
+        directory = spec_dir(args, servers)
+        if args.supervise:
+            sys.exit(supervise(args, servers, directory))
+        if args.stop_daemon:
+            sys.exit(stop_daemon(directory))
+        sys.exit(run_with_daemon(args, servers, directory, commands))
+
+    if args.log_dir:
+        os.makedirs(args.log_dir, exist_ok=True)
 
     server_processes = []
+    watchers = []
 
     try:
-        # Start all servers
-        for i, server in enumerate(servers):
-            print(f"Starting server {i+1}/{len(servers)}: {server['cmd']}")
-
-            # Use shell=True to support commands with cd and &&
-            process = subprocess.Popen(
-                server['cmd'],
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            server_processes.append(process)
+        assign_ports(servers)
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    export_ports([server['port'] for server in servers])
 
-            # Wait for this server to be ready
-            print(f"Waiting for server on port {server['port']}...")
-            if not is_server_ready(server['port'], timeout=args.timeout):
-                raise RuntimeError(f"Server failed to start on port {server['port']} within {args.timeout}s")
+    try:
+        server_processes, watchers = start_servers(servers, args, args.log_dir)
 
-            print(f"Server ready on port {server['port']}")
+        for i, server in enumerate(servers):
+            print(f"Waiting for server {i+1}: {describe_probe(server['probe'], server['port'])}")
+        print(f"Deadline: {args.timeout}s")
+        try:
+            ready_at = wait_for_servers(servers, server_processes, args.timeout, watchers)
+        except RuntimeError:
+            dump_server_logs(servers, watchers, args.dump_lines)
+            raise
 
-        print(f"\nAll {len(servers)} server(s) ready")
+        print(f"\nAll {len(servers)} server(s) ready in {max(ready_at):.2f}s")
 
-        # Run the command
-        print(f"Running: {' '.join(args.command)}\n")
-        result = subprocess.run(args.command)
-        sys.exit(result.returncode)
+        # Run the command(s)
+        sampler = sample_resources(args, servers, [process.pid for process in server_processes])
+        try:
+            returncode = run_commands(commands, args.jobs)
+        finally:
+            finish_sampling(sampler, args)
+        if returncode != 0:
+            dump_server_logs(servers, watchers, args.dump_lines)
+        sys.exit(returncode)
 
     finally:
         # Clean up all servers
-        print(f"\nStopping {len(server_processes)} server(s)...")
-        for i, process in enumerate(server_processes):
-            try:
-                process.terminate()
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                process.wait()
-            print(f"Server {i+1} stopped")
-        print("All servers stopped")
+        stop_servers(server_processes, [server['port'] for server in servers])
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -6,6 +6,13 @@ export const MapController = () => {
     const map = useMap()
     const { selectedPlace, setMapCenter } = useMapStore()
 
+    // Test hook: lets the acceptance benchmarks drive the camera (bench_map.py)
+    useEffect(() => {
+        if (!map || !(import.meta.env.DEV || import.meta.env.VITE_EXPOSE_TEST_HOOKS === 'true')) return
+        window.__traveldotMap = map
+        return () => { delete window.__traveldotMap }
+    }, [map])
+
     useEffect(() => {
         if (!map || !selectedPlace) return
 
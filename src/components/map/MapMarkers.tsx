@@ -2,6 +2,7 @@ import { useMap, useMapsLibrary } from '@vis.gl/react-google-maps'
 import { useMapStore } from '@/stores/mapStore'
 import { DEFAULT_PLACE_COLOR } from '@/utils/colors'
 import { useEffect, useRef } from 'react'
+import { measureSince } from '@/utils/perf'
 
 export const MapMarkers = () => {
     const map = useMap()
@@ -13,6 +14,7 @@ export const MapMarkers = () => {
     useEffect(() => {
         if (!map || !markerLib) return
 
+        const start = performance.now()
         const currentIds = new Set(places.map(p => p.id))
 
         // Remove markers no longer in places
@@ -65,6 +67,7 @@ export const MapMarkers = () => {
                 markersRef.current[place.id] = marker
             }
         })
+        measureSince('map:syncMarkers', start, { places: places.length, markers: Object.keys(markersRef.current).length })
     }, [map, markerLib, places, selectedPlace])
 
     // Selected marker
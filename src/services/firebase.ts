@@ -1,6 +1,6 @@
 import { initializeApp } from "firebase/app";
-import { getAuth } from "firebase/auth";
-import { getFirestore } from "firebase/firestore";
+import { connectAuthEmulator, getAuth } from "firebase/auth";
+import { connectFirestoreEmulator, getFirestore } from "firebase/firestore";
 import { getStorage } from "firebase/storage";
 
 const firebaseConfig = {
@@ -17,3 +17,13 @@ const app = initializeApp(firebaseConfig);
 export const auth = getAuth(app);
 export const db = getFirestore(app);
 export const storage = getStorage(app);
+
+// Local Auth + Firestore emulators (firebase.json) for the acceptance suite
+if (import.meta.env.VITE_USE_FIREBASE_EMULATOR === "true") {
+    const authHost = import.meta.env.VITE_FIREBASE_AUTH_EMULATOR_HOST || "127.0.0.1:9099";
+    const [firestoreHost, firestorePort] = (
+        import.meta.env.VITE_FIRESTORE_EMULATOR_HOST || "127.0.0.1:8080"
+    ).split(":");
+    connectAuthEmulator(auth, `http://${authHost}`, { disableWarnings: true });
+    connectFirestoreEmulator(db, firestoreHost, Number(firestorePort));
+}
@@ -14,6 +14,7 @@ import {
     writeBatch
 } from "firebase/firestore";
 import { db } from "./firebase";
+import { measureSince } from "@/utils/perf";
 
 // Types corresponding to Firestore Schema
 export interface TripData {
@@ -171,6 +172,7 @@ export const createPlace = async (userId: string, tripId: string, placeData: Omi
         updatedAt: new Date()
     };
 
+    const start = performance.now();
     await setDoc(placeRef.withConverter(placeConverter), newPlace);
 
     // Update place count on trip
@@ -178,6 +180,7 @@ export const createPlace = async (userId: string, tripId: string, placeData: Omi
     await updateDoc(tripRef, {
         placesCount: increment(1)
     });
+    measureSince("firestore:createPlace", start, { placeId: placeRef.id, photos: placeData.content.media.length });
 
     return placeRef.id;
 };
@@ -206,7 +209,9 @@ export const updatePlace = async (userId: string, tripId: string, placeId: strin
     const firestoreUpdates: any = { ...updateData, updatedAt: serverTimestamp() };
     if (updates.visitedDate) firestoreUpdates.visitedDate = Timestamp.fromDate(updates.visitedDate);
 
+    const start = performance.now();
     await setDoc(placeRef, firestoreUpdates, { merge: true });
+    measureSince("firestore:updatePlace", start, { placeId, photos: updates.content?.media.length });
 };
 
 export const deletePlace = async (userId: string, tripId: string, placeId: string) => {
@@ -1,4 +1,5 @@
 import { compressImage } from "@/utils/imageCompression";
+import { measureSince, perfId } from "@/utils/perf";
 
 const CLOUDINARY_CLOUD_NAME = "dujupddme";
 const CLOUDINARY_UPLOAD_PRESET = "Traveldot";
@@ -9,24 +10,45 @@ export const uploadPhoto = async (
     file: File,
     onProgress?: (progress: number) => void
 ): Promise<string> => {
+    const uploadId = perfId();
+    const detail = { uploadId, file: file.name, bytes: file.size };
+
     // 1. Compress image
+    let stageStart = performance.now();
     const compressedFile = await compressImage(file, {
         maxSizeMB: 1,
         maxWidthOrHeight: 1920,
         useWebWorker: true,
     });
+    measureSince("uploadPhoto:compress", stageStart, { ...detail, compressedBytes: compressedFile.size });
 
     // 2. Build FormData
+    stageStart = performance.now();
     const formData = new FormData();
     formData.append("file", compressedFile);
     formData.append("upload_preset", CLOUDINARY_UPLOAD_PRESET);
     formData.append("folder", `traveldot/${userId}/${tripId}`);
+    measureSince("uploadPhoto:formdata", stageStart, detail);
 
     // 3. Upload via XHR to support progress callback
     return new Promise((resolve, reject) => {
         const xhr = new XMLHttpRequest();
+        const uploadStart = performance.now();
+        let progressEvents = 0;
+        let firstProgress: number | undefined;
+        const measureUpload = (ok: boolean) =>
+            measureSince("uploadPhoto:upload", uploadStart, {
+                ...detail,
+                compressedBytes: compressedFile.size,
+                status: xhr.status,
+                ok,
+                progressEvents,
+                firstProgressMs: firstProgress,
+            });
 
         xhr.upload.onprogress = (event) => {
+            progressEvents++;
+            if (firstProgress === undefined) firstProgress = performance.now() - uploadStart;
             if (event.lengthComputable) {
                 const progress = (event.loaded / event.total) * 100;
                 onProgress?.(progress);
@@ -34,6 +56,7 @@ export const uploadPhoto = async (
         };
 
         xhr.onload = () => {
+            measureUpload(xhr.status === 200);
             if (xhr.status === 200) {
                 const response = JSON.parse(xhr.responseText);
                 resolve(response.secure_url);
@@ -42,7 +65,10 @@ export const uploadPhoto = async (
             }
         };
 
-        xhr.onerror = () => reject(new Error("Upload failed"));
+        xhr.onerror = () => {
+            measureUpload(false);
+            reject(new Error("Upload failed"));
+        };
 
         xhr.open(
             "POST",
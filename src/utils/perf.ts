@@ -0,0 +1,18 @@
+// User Timing helpers. Measures show up in DevTools' Performance panel and
+// are read back by the acceptance benchmarks (tests/acceptance/bench_*.py).
+
+export type MeasureDetail = Record<string, string | number | boolean | undefined>;
+
+let nextId = 0;
+
+/** A page-unique id for correlating the measures of one operation. */
+export const perfId = (): number => ++nextId;
+
+/** Record a `performance.measure` from `start` (a performance.now() value) to now. */
+export const measureSince = (name: string, start: number, detail?: MeasureDetail): void => {
+    try {
+        performance.measure(name, { start, end: performance.now(), detail });
+    } catch {
+        // User Timing L3 unsupported; timings are diagnostics only
+    }
+};
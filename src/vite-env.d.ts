@@ -8,6 +8,14 @@ interface ImportMetaEnv {
     readonly VITE_FIREBASE_STORAGE_BUCKET: string
     readonly VITE_FIREBASE_MESSAGING_SENDER_ID: string
     readonly VITE_FIREBASE_APP_ID: string
+    readonly VITE_USE_FIREBASE_EMULATOR?: string
+    readonly VITE_FIREBASE_AUTH_EMULATOR_HOST?: string
+    readonly VITE_FIRESTORE_EMULATOR_HOST?: string
+    readonly VITE_EXPOSE_TEST_HOOKS?: string
+}
+
+interface Window {
+    __traveldotMap?: google.maps.Map
 }
 
 interface ImportMeta {
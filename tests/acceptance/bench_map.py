@@ -0,0 +1,182 @@
+"""
+Map interaction benchmark: pan/zoom smoothness with thousands of pins.
+
+Seeds one trip with 1k / 10k / 50k clustered places into the Firestore
+emulator (harness/seed_trips.py), opens it, and drives the Google Map
+through window.__traveldotMap (exposed by MapController in dev builds or
+with VITE_EXPOSE_TEST_HOOKS=true). At each zoom level it runs a scripted
+pan sequence and records:
+
+    frames        requestAnimationFrame timestamps -> FPS, frame-interval
+                  percentiles and jank (frames slower than 50 ms)
+    longtasks     PerformanceObserver('longtask') entries
+    markers       <gmp-advanced-marker> elements in the DOM / in the viewport,
+                  and cluster elements (0 until a clusterer is added)
+    map:syncMarkers  MapMarkers' marker sync measures (src/utils/perf.ts)
+
+Results go to artifacts/<test>/map_<n>.json. Setting MAP_BENCH_P95_FRAME_MS
+turns the frame-interval p95 into a regression gate.
+
+    pytest tests/acceptance/bench_map.py --bench --firebase-emulator -s
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from harness.auth import VIEWPORT, open_authenticated_page
+from harness.stats import percentile, summarize
+from harness.waits import MAP_SELECTOR, wait_for_element, wait_until
+
+ZOOM_LEVELS = [5, 8, 11, 13, 15, 17]
+JANK_FRAME_MS = 50
+P95_FRAME_BUDGET_MS = float(os.environ.get("MAP_BENCH_P95_FRAME_MS", 0)) or None
+
+# Installed before the app loads so the observers see everything
+INSTALL_PROBES_JS = """
+window.__mapBench = { recording: false, frames: [], longtasks: [] };
+new PerformanceObserver(list => {
+    if (!window.__mapBench.recording) return;
+    for (const e of list.getEntries()) window.__mapBench.longtasks.push({ start: e.startTime, duration: e.duration });
+}).observe({ type: 'longtask', buffered: false });
+const tick = t => {
+    if (window.__mapBench.recording) window.__mapBench.frames.push(t);
+    requestAnimationFrame(tick);
+};
+requestAnimationFrame(tick);
+"""
+
+COUNT_MARKERS_JS = """
+() => {
+    const map = document.querySelector('.gm-style');
+    const box = map ? map.getBoundingClientRect() : null;
+    const markers = Array.from(document.querySelectorAll('gmp-advanced-marker'));
+    const visible = box ? markers.filter(m => {
+        const r = m.getBoundingClientRect();
+        return r.width && r.right >= box.left && r.left <= box.right && r.bottom >= box.top && r.top <= box.bottom;
+    }).length : 0;
+    return {
+        markers: markers.length,
+        visible,
+        clusters: document.querySelectorAll('[data-cluster], .cluster, [aria-label*="cluster" i]').length,
+    };
+}
+"""
+
+# Jump to a zoom level, wait for 'idle', then pan in a square and zoom
+# one step in and out, recording frames and long tasks throughout.
+RUN_SEQUENCE_JS = """
+async ({ zoom, center, steps, stepPx, gapMs }) => {
+    const map = window.__traveldotMap;
+    const idle = () => new Promise(resolve => google.maps.event.addListenerOnce(map, 'idle', resolve));
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+    let settled = idle();
+    map.setCenter(center);
+    map.setZoom(zoom);
+    await Promise.race([settled, sleep(5000)]);
+
+    const bench = window.__mapBench;
+    bench.frames = [];
+    bench.longtasks = [];
+    bench.recording = true;
+    const start = performance.now();
+    const moves = [[stepPx, 0], [0, stepPx], [-stepPx, 0], [0, -stepPx]];
+    for (const [dx, dy] of moves) {
+        for (let i = 0; i < steps; i++) {
+            map.panBy(dx, dy);
+            await sleep(gapMs);
+        }
+    }
+    for (const z of [zoom + 1, zoom]) {
+        settled = idle();
+        map.setZoom(z);
+        await Promise.race([settled, sleep(5000)]);
+    }
+    bench.recording = false;
+    return { frames: bench.frames, longtasks: bench.longtasks, durationMs: performance.now() - start };
+}
+"""
+
+
+def frame_stats(frames, duration_ms):
+    intervals = [b - a for a, b in zip(frames, frames[1:])]
+    jank = [i for i in intervals if i > JANK_FRAME_MS]
+    return {
+        "fps": round(len(intervals) / (duration_ms / 1000), 1) if duration_ms else None,
+        "frame_ms": summarize(intervals),
+        "p99_frame_ms": round(percentile(intervals, 99), 1) if intervals else None,
+        "jank_frames": len(jank),
+        "jank_pct": round(100 * len(jank) / len(intervals), 1) if intervals else None,
+    }
+
+
+@pytest.fixture
+def map_page(request, browser, app_url, seed_trips, profiler):
+    summary = seed_trips(trips=1, places=request.param)
+    context, page = open_authenticated_page(browser, app_url, viewport=VIEWPORT)
+    page.add_init_script(INSTALL_PROBES_JS)
+    # With --profile: main-thread CPU/heap of the map load, until the map is up
+    with profiler(page)("map_load"):
+        page.reload()
+        wait_for_element(page, MAP_SELECTOR, label="map")
+        wait_until(page, "() => !!window.__traveldotMap", "map test hook", timeout=15000)
+    yield page, summary
+    context.close()
+
+
+@pytest.mark.ac("AC-023")
+@pytest.mark.ac("AC-058")
+@pytest.mark.parametrize("map_page", [1_000, 10_000, 50_000], indirect=True, ids=lambda n: f"{n // 1000}k")
+def test_map_pan_zoom(map_page, artifact_dir):
+    page, seeded = map_page
+    places = seeded["places"]
+
+    # Markers are synced imperatively after the Firestore snapshot arrives
+    start = time.perf_counter()
+    wait_until(page, "n => document.querySelectorAll('gmp-advanced-marker').length >= n",
+               "markers rendered", timeout=180000, arg=int(places * 0.99))
+    markers_ready_ms = (time.perf_counter() - start) * 1000
+    sync = page.evaluate("""() => performance.getEntriesByName('map:syncMarkers')
+        .map(m => ({ duration: m.duration, ...(m.detail || {}) }))""")
+
+    # Pan around a busy area: the median marker position lies inside one
+    # of the trip's city clusters
+    center = page.evaluate("""() => {
+        const points = Array.from(document.querySelectorAll('gmp-advanced-marker'), m => m.position)
+            .filter(Boolean)
+            .map(p => typeof p.lat === 'function' ? { lat: p.lat(), lng: p.lng() } : p);
+        const median = values => values.sort((a, b) => a - b)[Math.floor(values.length / 2)];
+        return { lat: median(points.map(p => p.lat)), lng: median(points.map(p => p.lng)) };
+    }""")
+    levels = []
+    for zoom in ZOOM_LEVELS:
+        run = page.evaluate(RUN_SEQUENCE_JS, {"zoom": zoom, "center": center, "steps": 8, "stepPx": 120, "gapMs": 60})
+        counts = page.evaluate(COUNT_MARKERS_JS)
+        level = {
+            "zoom": zoom,
+            **frame_stats(run["frames"], run["durationMs"]),
+            "longtasks": len(run["longtasks"]),
+            "longtask_ms": round(sum(t["duration"] for t in run["longtasks"])),
+            **counts,
+        }
+        levels.append(level)
+        print(f"  z{zoom:>2}: {level['fps']} fps, p95 {level['frame_ms']['p95']} ms, "
+              f"jank {level['jank_pct']}%, long tasks {level['longtasks']}, visible markers {level['visible']}")
+
+    result = {
+        "places": places,
+        "markers_ready_ms": round(markers_ready_ms),
+        "sync_markers_ms": summarize(s["duration"] for s in sync),
+        "levels": levels,
+    }
+    path = os.path.join(artifact_dir, f"map_{places}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"  Report: {path}")
+
+    if P95_FRAME_BUDGET_MS:
+        slow = [lvl["zoom"] for lvl in levels if (lvl["frame_ms"]["p95"] or 0) > P95_FRAME_BUDGET_MS]
+        assert not slow, f"Frame p95 over {P95_FRAME_BUDGET_MS} ms at zoom levels {slow}"
@@ -0,0 +1,127 @@
+"""
+Page-load / startup benchmark per route, cold and warm cache.
+
+The app has no client-side router: "/" shows the login form when signed
+out and the map of the most recent trip when signed in. Those are the two
+routes measured here:
+
+    login   signed-out "/", ready when the email input is visible
+    map     signed-in "/" (landing = current trip's map), ready when the
+            Google Map and the Sidebar have rendered
+
+Cold runs use a fresh browser context (empty HTTP cache) per run; warm runs
+prime one context with a load and then reload it. For every run the
+harness records TTFB, FCP, LCP, total blocking time, JS bytes transferred
+and the Firestore/Auth/Maps request counts up to the moment the route is
+ready, i.e. before the first interaction is possible (harness/web_vitals.py).
+Medians over --bench-runs runs go to artifacts/<test>/page_load_<route>_<cache>.json.
+
+    pytest tests/acceptance/bench_page_load.py --bench --bench-runs 7 -s
+"""
+
+import json
+import os
+import statistics
+import time
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from harness.auth import VIEWPORT, new_authenticated_context
+from harness.waits import MAP_SELECTOR, wait_for_element, wait_until
+from harness.web_vitals import VITALS_INIT_JS, NetworkTally, collect_vitals
+
+ROUTES = {
+    "login": {"auth": False, "ready": ['input[type="email"]']},
+    "map": {"auth": True, "ready": [MAP_SELECTOR, "text=Sign out"]},
+}
+# LCP can still change after the ready selector shows up; wait for this
+# long without new resources, paints or long tasks before reading it
+QUIET_MS = 1000
+QUIET_JS = """
+quietMs => {
+    const v = window.__vitals || { longtasks: [] };
+    const resources = performance.getEntriesByType('resource');
+    const last = Math.max(
+        v.lcp || 0,
+        resources.length ? resources[resources.length - 1].responseEnd : 0,
+        ...v.longtasks.map(([start, duration]) => start + duration),
+    );
+    return performance.now() - last > quietMs;
+}
+"""
+
+
+def new_context(browser, app_url, route):
+    if ROUTES[route]["auth"]:
+        return new_authenticated_context(browser, app_url, viewport=VIEWPORT)
+    return browser.new_context(viewport=VIEWPORT)
+
+
+def measure_load(page, tally, app_url, route):
+    """Navigate and return this load's metrics."""
+    tally.reset()
+    start = time.perf_counter()
+    page.goto(app_url, wait_until="commit")
+    for selector in ROUTES[route]["ready"]:
+        wait_for_element(page, selector, timeout=30000, label=f"{route} ready")
+    ready_ms = (time.perf_counter() - start) * 1000
+    before_interaction = tally.snapshot()
+
+    try:
+        wait_until(page, QUIET_JS, "quiet window", timeout=15000, arg=QUIET_MS)
+    except PlaywrightTimeoutError:
+        pass
+    vitals = collect_vitals(page)
+    if route == "map":
+        # Signed-in loads must not have fallen back to the login form
+        assert page.locator('input[type="email"]').count() == 0, "Cached session was not restored"
+    return {
+        "ready_ms": round(ready_ms),
+        **{k: round(v, 1) if isinstance(v, float) else v for k, v in vitals.items() if k != "now_ms"},
+        **before_interaction,
+        "total_bytes_after_quiet": tally.snapshot()["total_bytes"],
+    }
+
+
+def medians(runs):
+    keys = [k for k in runs[0] if all(isinstance(r.get(k), (int, float)) for r in runs)]
+    return {k: round(statistics.median(r[k] for r in runs), 1) for k in keys}
+
+
+@pytest.mark.ac("AC-057")
+@pytest.mark.ac("AC-058")
+@pytest.mark.parametrize("cache", ["cold", "warm"])
+@pytest.mark.parametrize("route", list(ROUTES))
+def test_page_load(browser, app_url, route, cache, artifact_dir, pytestconfig):
+    count = pytestconfig.getoption("--bench-runs")
+    runs = []
+
+    if cache == "cold":
+        for _ in range(count):
+            context = new_context(browser, app_url, route)
+            page = context.new_page()
+            page.add_init_script(VITALS_INIT_JS)
+            tally = NetworkTally(page)
+            runs.append(measure_load(page, tally, app_url, route))
+            context.close()
+    else:
+        context = new_context(browser, app_url, route)
+        page = context.new_page()
+        page.add_init_script(VITALS_INIT_JS)
+        tally = NetworkTally(page)
+        measure_load(page, tally, app_url, route)  # prime the cache
+        for _ in range(count):
+            runs.append(measure_load(page, tally, app_url, route))
+        context.close()
+
+    result = {"route": route, "cache": cache, "runs": len(runs), "median": medians(runs), "samples": runs}
+    path = os.path.join(artifact_dir, f"page_load_{route}_{cache}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+
+    m = result["median"]
+    print(f"\n  {route}/{cache}: ready {m.get('ready_ms')} ms, TTFB {m.get('ttfb_ms')}, FCP {m.get('fcp_ms')}, "
+          f"LCP {m.get('lcp_ms')}, TBT {m.get('tbt_ms')}, JS {m.get('js_bytes', 0) / 1024:.0f} KB, "
+          f"firestore {m.get('firestore_requests')}, maps {m.get('maps_requests')} requests")
+    print(f"  Report: {path}")
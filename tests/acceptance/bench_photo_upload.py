@@ -0,0 +1,123 @@
+"""
+Photo upload pipeline benchmark (built on the AC-035 scenario).
+
+Pushes batches of N = 1, 10, 50 camera-sized (4000x3000) JPEGs of 2-12 MB
+from harness/image_corpus.py through the PlaceEditor file input, saves,
+and reads back the User Timing measures that src/services/storage.ts and
+firestore.ts record for every photo:
+
+    uploadPhoto:compress   compressImage() (browser-image-compression, web worker)
+    uploadPhoto:formdata   FormData build
+    uploadPhoto:upload     XHR POST until onload (progress event count in detail)
+    firestore:*Place       createPlace / updatePlace after all uploads settle
+
+Per-stage p50/p95/max (ms) and throughput are written as JSON to
+artifacts/<test>/photo_upload_N<n>.json. Uploads go to the local Cloudinary
+stub unless --real-cloudinary is given; shape it with --stub-latency and
+--stub-throughput. Photos above PlaceEditor's 10 MB limit are rejected
+before upload and reported as `rejected`.
+
+    pytest tests/acceptance/bench_photo_upload.py --bench -s
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from harness.editor import open_place_editor
+from harness.image_corpus import generate_corpus
+from harness.stats import summarize
+from harness.waits import MAP_SELECTOR, wait_for_element, wait_for_modal_closed, wait_until
+
+MB = 1024 * 1024
+STAGES = ["uploadPhoto:compress", "uploadPhoto:formdata", "uploadPhoto:upload"]
+
+READ_MEASURES_JS = """
+() => performance.getEntriesByType('measure')
+    .filter(m => m.name.startsWith('uploadPhoto:') || m.name.startsWith('firestore:'))
+    .map(m => ({ name: m.name, start: m.startTime, duration: m.duration, detail: m.detail || {} }))
+"""
+
+
+def summarize_run(count, sizes, measures, wall_ms):
+    by_stage = {stage: [m for m in measures if m["name"] == stage] for stage in STAGES}
+    uploads = by_stage["uploadPhoto:upload"]
+    saves = [m for m in measures if m["name"].startswith("firestore:")]
+    uploaded = [m for m in uploads if m["detail"].get("ok")]
+    compressed_bytes = sum(m["detail"].get("compressedBytes", 0) for m in uploaded)
+    upload_span = (max(m["start"] + m["duration"] for m in uploads) - min(m["start"] for m in uploads)
+                   if uploads else 0)
+
+    return {
+        "photos": count,
+        "input_mb": round(sum(sizes) / MB, 1),
+        "input_sizes_mb": summarize([s / MB for s in sizes], 2),
+        "rejected": count - len(by_stage["uploadPhoto:compress"]),
+        "uploaded": len(uploaded),
+        "failed_uploads": len(uploads) - len(uploaded),
+        "stages_ms": {
+            **{stage.split(":")[1]: summarize(m["duration"] for m in found) for stage, found in by_stage.items()},
+            "firestore": summarize(m["duration"] for m in saves),
+        },
+        "firestore_op": saves[0]["name"].split(":")[1] if saves else None,
+        "compression_ratio": summarize(
+            [m["detail"]["bytes"] / m["detail"]["compressedBytes"]
+             for m in by_stage["uploadPhoto:compress"] if m["detail"].get("compressedBytes")], 2),
+        "upload_progress_events": summarize(m["detail"].get("progressEvents", 0) for m in uploads),
+        "wall_ms": round(wall_ms),
+        "throughput": {
+            "photos_per_s": round(len(uploaded) / (wall_ms / 1000), 2) if wall_ms else None,
+            "input_mb_per_s": round(sum(sizes) / MB / (wall_ms / 1000), 2) if wall_ms else None,
+            "upload_mb_per_s": round(compressed_bytes / MB / (upload_span / 1000), 2) if upload_span else None,
+        },
+    }
+
+
+@pytest.fixture
+def editor_page(request, authed_page, cloudinary):
+    page = authed_page
+    if request.config.getoption("--firebase-emulator"):
+        # A place to open via PlacePreview's 編輯 button
+        firebase = request.getfixturevalue("firebase")
+        trip_id = firebase.seed_trip(firebase.uid, "Photo bench")
+        firebase.seed_place(firebase.uid, trip_id, "Photo bench place", 13.7563, 100.5018)
+        page.reload()
+    wait_for_element(page, MAP_SELECTOR, label="map")
+    if not open_place_editor(page):
+        pytest.fail("BLOCKED: PlaceEditor could not be opened")
+    return page
+
+
+@pytest.mark.ac("AC-035")
+@pytest.mark.parametrize("count", [1, 10, 50])
+def test_photo_upload_pipeline(editor_page, count, artifact_dir):
+    page = editor_page
+    page.evaluate("performance.clearMeasures()")
+
+    photos = generate_corpus(count, size_mb=(2, 12), formats=("jpeg",), seed=count)
+    sizes = [photo["bytes"] for photo in photos]
+    print(f"\n[Bench] {count} photos, {sum(sizes) / MB:.0f} MB")
+    page.locator('input[type="file"]').first.set_input_files([photo["path"] for photo in photos])
+    wait_until(page, "n => document.querySelectorAll('img[src^=\"blob:\"]').length >= n",
+               "photo previews", timeout=60000, arg=count)
+
+    start = time.perf_counter()
+    page.locator("button").filter(has_text="儲存").first.click()
+    # Every upload has PlaceEditor's own 20 s timeout, plus 10 s for Firestore
+    closed = wait_for_modal_closed(page, timeout=120000)
+    wall_ms = (time.perf_counter() - start) * 1000
+    wait_until(page, "() => performance.getEntriesByName('firestore:createPlace').length"
+                     " + performance.getEntriesByName('firestore:updatePlace').length > 0",
+               "firestore measure", timeout=5000)
+
+    result = summarize_run(count, sizes, page.evaluate(READ_MEASURES_JS), wall_ms)
+    path = os.path.join(artifact_dir, f"photo_upload_N{count}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(json.dumps(result, indent=2))
+    print(f"  Report: {path}")
+
+    assert closed, "PlaceEditor did not close after saving"
+    assert result["uploaded"] > 0, "No photo was uploaded"
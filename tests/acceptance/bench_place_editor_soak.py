@@ -0,0 +1,159 @@
+"""
+PlaceEditor memory soak: open, add photos, save or cancel, close, repeated.
+
+The test seeds one trip with one place. Each cycle opens that place in
+the editor (PlacePreview's 編輯 button), adds two photos (blob: previews)
+and then either closes it with the X button or, every SAVE_EVERY-th cycle,
+saves through the Cloudinary stub. A save only updates the place, and its
+seeded fields are written back right after, so the place looks the same
+at the start of every cycle and anything that keeps growing is held by
+the app.
+
+Every SAMPLE_EVERY cycles the page is garbage collected and sampled over
+CDP (harness/memory.py): JS heap, DOM nodes, event listeners, live
+Blob/File objects and unrevoked blob: URLs. After WARMUP_CYCLES a
+least-squares slope per cycle is fitted for each metric and the run fails
+if any slope is over LIMITS (override with SOAK_MAX_<METRIC>_PER_CYCLE,
+e.g. SOAK_MAX_HEAP_USED_PER_CYCLE=65536). Samples and slopes go to
+artifacts/<test>/soak.json.
+
+    pytest tests/acceptance/bench_place_editor_soak.py --bench --firebase-emulator --soak-cycles 300 -s
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from harness.editor import open_place_editor
+from harness.image_corpus import corpus_paths
+from harness.memory import OBJECT_URLS_INIT_JS, MemorySampler
+from harness.waits import MAP_SELECTOR, wait_for_element, wait_for_modal_closed, wait_until
+
+PHOTOS_PER_CYCLE = 2
+SAVE_EVERY = 5
+SAMPLE_EVERY = 5
+WARMUP_CYCLES = 20
+PLACE_NAME = "Soak place"
+PLACE_LOCATION = (13.7563, 100.5018)
+# The editor's X button, the one right before the layout toggle
+CLOSE_BUTTON = 'button:has(+ button[title^="切換為"])'
+ERROR_TOAST = '[data-sonner-toast][data-type="error"]'
+
+# Allowed growth per cycle once warmed up
+LIMITS = {
+    "heap_used": 32 * 1024,  # bytes
+    "nodes": 2,
+    "listeners": 1,
+    "blobs": 0.05,
+    "object_urls": 0.05,
+}
+UNITS = {"heap_used": "bytes", "nodes": "nodes", "listeners": "listeners", "blobs": "Blobs", "object_urls": "URLs"}
+
+
+# The place's Sidebar entry is back without a thumbnail, i.e. without photos
+PLACE_RESTORED_JS = """
+name => {
+    const entry = Array.from(document.querySelectorAll('div[class*="cursor-pointer"]'))
+        .find(el => el.querySelector('h3')?.textContent?.trim() === name);
+    return !!entry && !entry.querySelector('img');
+}
+"""
+
+
+def limits():
+    return {m: float(os.environ.get(f"SOAK_MAX_{m.upper()}_PER_CYCLE", v)) for m, v in LIMITS.items()}
+
+
+def seed_place(firebase):
+    """One trip with one place; returns the place's document path."""
+    trip_id = firebase.seed_trip(firebase.uid, "Soak trip")
+    place_id = firebase.seed_place(firebase.uid, trip_id, PLACE_NAME, *PLACE_LOCATION)
+    return f"users/{firebase.uid}/trips/{trip_id}/places/{place_id}"
+
+
+def restore_place(page, firebase, place_path):
+    """Write the seeded fields back over a save and re-select the place from the Sidebar."""
+    trip_id = place_path.split("/")[3]
+    firebase.set_document(place_path, firebase.place_document(trip_id, PLACE_NAME, *PLACE_LOCATION))
+    wait_until(page, PLACE_RESTORED_JS, "place restored", timeout=10000, arg=PLACE_NAME)
+    # The saved copy is still the selected place; the editor would reopen with its photos
+    page.locator('div[class*="cursor-pointer"]').filter(has=page.locator("h3", has_text=PLACE_NAME)).first.click()
+
+
+def run_cycle(page, firebase, place_path, cycle, photos, save):
+    if not open_place_editor(page):
+        pytest.fail(f"PlaceEditor could not be opened in cycle {cycle}")
+    page.locator('input[type="file"]').first.set_input_files(photos)
+    wait_until(page, "n => document.querySelectorAll('img[src^=\"blob:\"]').length >= n",
+               "photo previews", timeout=5000, arg=len(photos))
+
+    if not save:
+        page.locator(CLOSE_BUTTON).first.click()
+        wait_for_modal_closed(page, timeout=5000)
+        return
+
+    page.locator("button").filter(has_text="儲存").first.click()
+    if not wait_for_modal_closed(page, timeout=30000, unless=ERROR_TOAST):
+        pytest.fail(f"Save failed in cycle {cycle}: {page.locator(ERROR_TOAST).first.inner_text()}")
+    restore_place(page, firebase, place_path)
+
+
+@pytest.mark.ac("AC-034")
+@pytest.mark.ac("AC-035")
+def test_place_editor_soak(pytestconfig, authed_page, firebase, cloudinary, artifact_dir):
+    if cloudinary is None:
+        pytest.skip("soak saves upload hundreds of photos; run it against the Cloudinary stub")
+    cycles = pytestconfig.getoption("--soak-cycles")
+    photos = corpus_paths(PHOTOS_PER_CYCLE, width=1600, height=1200, seed=25)
+    page = authed_page
+    place_path = seed_place(firebase)
+    # The object URL counter has to be in place before the app's first createObjectURL
+    page.add_init_script(OBJECT_URLS_INIT_JS)
+    page.reload()
+    wait_for_element(page, MAP_SELECTOR, label="map")
+    open_sidebar = page.locator('[aria-label="Open sidebar"]')
+    if open_sidebar.count() and open_sidebar.first.is_visible():
+        open_sidebar.first.click()
+    wait_until(page, PLACE_RESTORED_JS, "seeded place listed", arg=PLACE_NAME)
+
+    memory = MemorySampler(page)
+    memory.sample(0)
+    start = time.perf_counter()
+    try:
+        for cycle in range(1, cycles + 1):
+            run_cycle(page, firebase, place_path, cycle, photos, save=cycle % SAVE_EVERY == 0)
+            if cycle % SAMPLE_EVERY == 0 or cycle == cycles:
+                sample = memory.sample(cycle)
+                if cycle % 50 == 0 or cycle == cycles:
+                    print(f"  cycle {cycle:>4}: heap {sample['heap_used'] / 1024 / 1024:.1f} MB, "
+                          f"nodes {sample['nodes']}, listeners {sample['listeners']}, "
+                          f"blobs {sample['blobs']}, blob URLs {sample['object_urls']} "
+                          f"({time.perf_counter() - start:.0f} s)")
+        growth = memory.growth(warmup=min(WARMUP_CYCLES, cycles // 5))
+    finally:
+        memory.detach()
+
+    allowed = limits()
+    print(f"\n  Growth per cycle over {cycles} cycles (after warm-up):")
+    for metric, fit in growth.items():
+        print(f"  {metric:>12}: {fit['slope']:>10.2f} {UNITS[metric]}/cycle (r2 {fit['r2']:.2f}, "
+              f"{fit['first']} -> {fit['last']}, limit {allowed[metric]:g})")
+
+    result = {
+        "cycles": cycles,
+        "photos_per_cycle": PHOTOS_PER_CYCLE,
+        "save_every": SAVE_EVERY,
+        "limits": allowed,
+        "growth": growth,
+        "samples": memory.samples,
+    }
+    path = os.path.join(artifact_dir, "soak.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"  Report: {path}")
+
+    leaks = {m: fit["slope"] for m, fit in growth.items() if fit["slope"] > allowed[m]}
+    assert not leaks, "Growth per cycle over the limit: " + ", ".join(
+        f"{m} +{slope:g} {UNITS[m]}/cycle (limit {allowed[m]:g})" for m, slope in leaks.items())
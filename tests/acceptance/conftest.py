@@ -0,0 +1,338 @@
+"""
+pytest fixtures for the Playwright acceptance suite.
+
+One Chromium per test session (per worker under pytest-xdist, `-n auto`),
+a fresh browser context per test:
+
+    page          logged-out page, for the auth scenarios (AC-001..AC-008)
+    authed_page   page restored from the cached storage state (harness/auth.py)
+    dom_events    toasts/dialogs/alerts of `page` and `authed_page` as they appear;
+                  dom_events.wait_for("toast", type="success") (harness/dom_events.py)
+    log_sink      log_sink(page, include=r"upload") captures console/network logs
+                  bounded, spilling to artifacts/<test>/<name>.ndjson.gz (harness/log_sink.py)
+    trace         (autouse) step/span timing of the test, written as a Chrome trace to
+                  artifacts/<test>/trace.json; trace.step("[Step 2] ...") marks steps
+                  (harness/tracing.py)
+    profiler      profile = profiler(page); with profile("photo_save"): ... saves
+                  .cpuprofile/.heapprofile and prints top functions, only with --profile
+                  (harness/profiling.py)
+    screenshot    screenshot(page, "name.png") into the test's artifact directory;
+                  encoded/written in the background (harness/screenshots.py), see
+                  --screenshots / --screenshot-format / --screenshot-quality; with
+                  --visual each capture is diffed against baselines/ (harness/visual_diff.py)
+    cloudinary    routes authed_page's Cloudinary uploads to the local stub
+                  (harness/cloudinary_stub.py); None with --real-cloudinary
+    firebase      with --firebase-emulator: FirebaseEmulator with `.uid` of this
+                  worker's account, whose trips/places are cleared before each test
+    seed_trips    seed_trips(trips=100, places=10_000) bulk-loads a synthetic
+                  dataset for that account (harness/seed_trips.py)
+
+Tests are tagged with @pytest.mark.ac("AC-035"); the area markers in
+pytest.ini (photos, places, ...) are added automatically from the AC number,
+so `-m photos` or `--ac AC-035,AC-036` select subsets. Benchmarks
+(bench_*.py) are marked `bench` and only run with --bench.
+
+Needs pytest, playwright, numpy and Pillow (photo fixtures) and, for -n,
+pytest-xdist.
+"""
+
+import os
+import re
+
+import pytest
+from playwright.sync_api import sync_playwright
+
+from harness import auth
+from harness.auth import VIEWPORT, open_authenticated_page, worker_account
+from harness.cloudinary_stub import CloudinaryStub, parse_rate, route_cloudinary
+from harness.dom_events import DomEvents
+from harness.firebase_emulator import FirebaseEmulator, stop_process_group
+from harness.locks import file_lock
+from harness.log_sink import LogSink
+from harness.profiling import Profiler
+from harness.screenshots import EXTENSIONS, MODES, Screenshots
+from harness.tracing import Tracer
+from harness.visual_diff import MAX_DIFF_RATIO, VisualBaselines
+from harness.seed_trips import seed_dataset
+
+ARTIFACTS_DIR = os.environ.get(
+    "ACCEPTANCE_ARTIFACTS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "artifacts")
+)
+
+AREAS = {
+    "auth": range(1, 9),
+    "trips": range(9, 20),
+    "map": [*range(20, 28), 55],
+    "places": range(28, 42),
+    "photos": [26, 35, 36, 37, 62],
+    "sidebar": range(42, 48),
+    "list": range(48, 51),
+    "share": range(51, 55),
+    "export": [66, 67],
+    "perf": range(57, 61),
+    "errors": range(61, 64),
+    "a11y": [64, 65],
+}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("acceptance")
+    group.addoption("--app-url", default=os.environ.get("ACCEPTANCE_BASE_URL", "http://localhost:5173"),
+                    help="URL of the running app (default: %(default)s)")
+    group.addoption("--ac", default=None,
+                    help="Only run these acceptance criteria, comma-separated (e.g. AC-001,AC-035)")
+    group.addoption("--show-browser", action="store_true", help="Run Chromium headed")
+    group.addoption("--real-cloudinary", action="store_true",
+                    help="Upload photos to api.cloudinary.com instead of the local stub")
+    group.addoption("--stub-latency", type=float, default=0.0,
+                    help="Seconds the Cloudinary stub adds to each upload")
+    group.addoption("--stub-throughput", type=parse_rate, default=None,
+                    help="Cloudinary stub upload rate cap, e.g. 512K or 2M (bytes/s)")
+    group.addoption("--bench", action="store_true", help="Also run the bench_*.py benchmarks")
+    group.addoption("--bench-runs", type=int, default=5,
+                    help="Repetitions per case for benchmarks that report medians (default: %(default)s)")
+    group.addoption("--soak-cycles", type=int, default=300,
+                    help="Open/close cycles for the PlaceEditor memory soak (default: %(default)s)")
+    group.addoption("--screenshots", choices=MODES, default="all",
+                    help="Write all screenshots, only those of failed tests, or none (default: %(default)s)")
+    group.addoption("--screenshot-format", choices=list(EXTENSIONS), default="jpeg",
+                    help="Screenshot file format (default: %(default)s)")
+    group.addoption("--screenshot-quality", type=int, default=80,
+                    help="JPEG/WebP screenshot quality (default: %(default)s)")
+    group.addoption("--visual", action="store_true",
+                    help="Diff every screenshot against tests/acceptance/baselines and fail on regressions")
+    group.addoption("--update-baselines", action="store_true",
+                    help="Record every screenshot as the new visual baseline")
+    group.addoption("--max-diff-ratio", type=float, default=MAX_DIFF_RATIO,
+                    help="Share of unmasked pixels a --visual capture may change (default: %(default)s, "
+                         "any changed pixel fails); only for screens known to be noisy")
+    group.addoption("--profile", action="store_true",
+                    help="Record JS CPU/heap profiles of the steps scenarios mark with the profiler fixture")
+    group.addoption("--firebase-emulator", action="store_true",
+                    help="Use the local Auth/Firestore emulators; the app must be served with "
+                         "VITE_USE_FIREBASE_EMULATOR=true VITE_FIREBASE_PROJECT_ID=demo-traveldot")
+
+
+def emulator_pid_path():
+    return os.path.join(auth.STATE_DIR, "firebase-emulator.pid")
+
+
+def pytest_configure(config):
+    if config.getoption("--firebase-emulator"):
+        # Emulator sessions must not reuse logins cached against the real project
+        auth.STATE_DIR = os.path.join(auth.STATE_DIR, "emulator")
+        if not hasattr(config, "workerinput") and os.path.exists(emulator_pid_path()):
+            os.remove(emulator_pid_path())  # Left by an interrupted run
+
+
+def pytest_sessionfinish(session):
+    # On the xdist controller, after every worker has finished: stop the
+    # emulator a worker started for the run
+    if hasattr(session.config, "workerinput") or not os.path.exists(emulator_pid_path()):
+        return
+    with open(emulator_pid_path()) as f:
+        pid = int(f.read())
+    os.remove(emulator_pid_path())
+    stop_process_group(pid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Exposes item.rep_setup / rep_call / rep_teardown to fixtures
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def ac_ids(item):
+    return [mark.args[0] for mark in item.iter_markers("ac")]
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if item.path.name.startswith("bench_"):
+            item.add_marker("bench")
+            if not config.getoption("--bench"):
+                item.add_marker(pytest.mark.skip(reason="benchmark; run with --bench"))
+        for ac in ac_ids(item):
+            number = int(re.sub(r"\D", "", ac))
+            for area, numbers in AREAS.items():
+                if number in numbers:
+                    item.add_marker(area)
+
+    wanted = config.getoption("--ac")
+    if not wanted:
+        return
+    wanted = {ac.strip().upper() for ac in wanted.split(",") if ac.strip()}
+    selected, deselected = [], []
+    for item in items:
+        (selected if wanted & set(ac_ids(item)) else deselected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.fixture(scope="session")
+def app_url(pytestconfig):
+    return pytestconfig.getoption("--app-url").rstrip("/")
+
+
+@pytest.fixture(scope="session")
+def browser(pytestconfig):
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=not pytestconfig.getoption("--show-browser"))
+        yield browser
+        browser.close()
+
+
+@pytest.fixture
+def dom_events():
+    return DomEvents()
+
+
+@pytest.fixture
+def context(browser, dom_events):
+    context = browser.new_context(viewport=VIEWPORT)
+    dom_events.install(context)
+    yield context
+    context.close()
+
+
+@pytest.fixture
+def page(context):
+    return context.new_page()
+
+
+@pytest.fixture
+def authed_page(request, browser, app_url, dom_events):
+    if request.config.getoption("--firebase-emulator"):
+        request.getfixturevalue("firebase")
+    context, page = open_authenticated_page(browser, app_url, setup=dom_events.install, viewport=VIEWPORT)
+    yield page
+    context.close()
+
+
+@pytest.fixture
+def artifact_dir(request):
+    path = os.path.join(ARTIFACTS_DIR, re.sub(r"[^\w.-]+", "_", request.node.name))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def trace(request, artifact_dir):
+    tracer = Tracer(request.node.name).activate()
+    yield tracer
+    tracer.finish()
+    if tracer.spans:
+        path = tracer.write(os.path.join(artifact_dir, "trace.json"))
+        print("\n" + tracer.summary())
+        print(f"  Trace: {path}")
+
+
+@pytest.fixture
+def screenshot(request, artifact_dir):
+    config = request.config
+    update = config.getoption("--update-baselines")
+    shots = Screenshots(
+        artifact_dir,
+        fmt=config.getoption("--screenshot-format"),
+        quality=config.getoption("--screenshot-quality"),
+        mode=config.getoption("--screenshots"),
+        visual=VisualBaselines(update=update, max_diff_ratio=config.getoption("--max-diff-ratio"))
+        if update or config.getoption("--visual") else None,
+        test=os.path.basename(artifact_dir),
+    )
+    yield shots
+    failed = any(getattr(getattr(request.node, f"rep_{when}", None), "failed", False) for when in ("setup", "call"))
+    shots.close(failed=failed)
+    regressions = shots.visual_failures()
+    if regressions:
+        pytest.fail("Visual regression: " + ", ".join(
+            f"{r['name']} ({r['status']}, see {r.get('heatmap', r['baseline'])})" for r in regressions
+        ))
+
+
+@pytest.fixture
+def log_sink(artifact_dir):
+    sinks = []
+
+    def attach(target, name="logs", **options):
+        sink = LogSink(spill_path=os.path.join(artifact_dir, f"{name}.ndjson.gz"), **options).attach(target)
+        sinks.append(sink)
+        return sink
+    yield attach
+    for sink in sinks:
+        sink.close()
+
+
+@pytest.fixture
+def profiler(request, artifact_dir):
+    enabled = request.config.getoption("--profile")
+    profilers = []
+
+    def attach(page, **options):
+        profile = Profiler(page, artifact_dir, enabled=enabled, **options)
+        profilers.append(profile)
+        return profile
+    yield attach
+    for profile in profilers:
+        profile.detach()
+
+
+@pytest.fixture(scope="session")
+def cloudinary_stub(pytestconfig, tmp_path_factory):
+    with CloudinaryStub(root=str(tmp_path_factory.mktemp("cloudinary")),
+                        latency=pytestconfig.getoption("--stub-latency"),
+                        throughput=pytestconfig.getoption("--stub-throughput")) as stub:
+        yield stub
+
+
+@pytest.fixture
+def cloudinary(request, authed_page):
+    if request.config.getoption("--real-cloudinary"):
+        yield None
+        return
+    stub = request.getfixturevalue("cloudinary_stub")
+    stub.reset()
+    route_cloudinary(authed_page.context, stub)
+    yield stub
+
+
+@pytest.fixture(scope="session")
+def firebase_emulator(request):
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    # Workers race to start the shared emulator: the first one starts it, the rest attach
+    with file_lock(os.path.join(auth.STATE_DIR, "firebase-emulator.lock")):
+        emulator = FirebaseEmulator().start()
+        if worker and emulator.process:
+            with open(emulator_pid_path(), "w") as f:
+                f.write(str(emulator.process.pid))
+    # Under xdist the workers share one emulator, so only a serial run wipes it;
+    # workers clean up their own account's data in the `firebase` fixture.
+    if not worker:
+        emulator.reset()
+        auth.invalidate_storage_state()
+    yield emulator
+    # Other workers may still be using it; the controller stops it in pytest_sessionfinish
+    if not worker:
+        emulator.stop()
+
+
+@pytest.fixture
+def firebase(request):
+    if not request.config.getoption("--firebase-emulator"):
+        pytest.skip("needs --firebase-emulator")
+    emulator = request.getfixturevalue("firebase_emulator")
+    emulator.uid = emulator.ensure_user(*worker_account())
+    emulator.clear_user_data(emulator.uid)
+    return emulator
+
+
+@pytest.fixture
+def seed_trips(firebase):
+    def seed(trips=10, places=1000, **kwargs):
+        summary = seed_dataset(firebase, firebase.uid, trips, places, clear=False, **kwargs)
+        print(f"  Seeded {trips} trips / {places} places in {summary['total_s']}s")
+        return summary
+    return seed
@@ -0,0 +1,6 @@
+"""
+Shared helpers for the Playwright acceptance scenarios in tests/acceptance/.
+
+Scenario scripts import these as `from harness.<module> import ...`; running a
+script directly puts tests/acceptance/ on sys.path, so no install is needed.
+"""
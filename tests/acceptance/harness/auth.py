@@ -0,0 +1,149 @@
+"""
+Cached, pre-authenticated browser contexts for the acceptance scenarios.
+
+Scenarios that are not about authentication itself (everything except
+AC-001 register and AC-005 login) should not pay for the signup/login UI
+on every run. Instead each worker signs in once with a fixed per-worker
+account and saves Playwright's storage_state, including IndexedDB, where
+the Firebase Auth SDK persists its session. Later contexts are created
+from that file and start out logged in.
+
+Reusing a fixed account per worker also stops every run from creating
+another playwright_test_<timestamp>@example.com user.
+
+    context, page = open_authenticated_page(browser, viewport=VIEWPORT)
+
+Needs Playwright >= 1.51 for storage_state(indexed_db=True).
+"""
+
+import os
+import tempfile
+import time
+
+from harness.waits import wait_for_element, wait_until
+
+BASE_URL = "http://localhost:5173"
+# Browser viewport of every scenario and benchmark
+VIEWPORT = {"width": 1280, "height": 800}
+STATE_DIR = os.environ.get(
+    "ACCEPTANCE_STATE_DIR", os.path.join(tempfile.gettempdir(), "traveldot-acceptance")
+)
+# Firebase refreshes its ID token from the persisted refresh token, so a
+# saved session stays usable for a long time; re-login daily regardless.
+STATE_MAX_AGE = 24 * 60 * 60
+
+TEST_PASSWORD = "Test1234!"
+
+
+def worker_id():
+    """Identifier of the current test worker ("main" outside pytest-xdist)."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def worker_account(worker=None):
+    """Email/password of the fixed test account used by a worker."""
+    return f"playwright_{worker or worker_id()}@example.com", TEST_PASSWORD
+
+
+def storage_state_path(worker=None):
+    return os.path.join(STATE_DIR, f"auth-{worker or worker_id()}.json")
+
+
+def invalidate_storage_state(worker=None):
+    """Forget the cached session, e.g. after the account was deleted."""
+    try:
+        os.remove(storage_state_path(worker))
+    except FileNotFoundError:
+        pass
+
+
+def _submit_and_wait(page, label):
+    """Submit the visible auth form; True once the app leaves the auth page."""
+    page.locator('button[type="submit"]').first.click()
+    result = wait_until(
+        page,
+        """() => {
+            if (!document.querySelector('input[type="email"]')) return 'ok';
+            const error = document.querySelector('.text-red-500');
+            return error && error.textContent.trim() ? 'error' : false;
+        }""",
+        label,
+    )
+    return result == "ok"
+
+
+def sign_in(page, email, password, base_url=BASE_URL):
+    """Log in through the UI, signing the account up first if it does not exist."""
+    page.goto(base_url)
+    wait_for_element(page, 'input[type="email"]', label="login form")
+    page.fill('input[type="email"]', email)
+    page.fill('input[type="password"]', password)
+    if _submit_and_wait(page, "login"):
+        return
+
+    # Unknown account (or wrong password): register it instead
+    print(f"  Login failed for {email}, signing up...")
+    page.locator("text=註冊新帳號").first.click()
+    wait_for_element(page, 'input[placeholder="再次輸入密碼"]', label="signup form")
+    page.fill('input[type="email"]', email)
+    page.fill('input[placeholder="至少 8 個字元"]', password)
+    page.fill('input[placeholder="再次輸入密碼"]', password)
+    if not _submit_and_wait(page, "signup"):
+        errors = page.locator(".text-red-500").all_text_contents()
+        raise RuntimeError(f"Could not sign in or sign up {email}: {errors}")
+
+
+def ensure_storage_state(browser, base_url=BASE_URL, max_age=STATE_MAX_AGE):
+    """Return the path of a fresh storage_state file for this worker, logging in if needed."""
+    path = storage_state_path()
+    try:
+        if time.time() - os.path.getmtime(path) < max_age:
+            return path
+    except OSError:
+        pass
+
+    email, password = worker_account()
+    start = time.perf_counter()
+    context = browser.new_context()
+    try:
+        page = context.new_page()
+        sign_in(page, email, password, base_url)
+        # The Sidebar only renders for a signed-in user
+        wait_for_element(page, "text=Sign out", label="signed in")
+        os.makedirs(STATE_DIR, exist_ok=True)
+        context.storage_state(path=path, indexed_db=True)
+    finally:
+        context.close()
+    print(f"  Saved auth state for {email} in {(time.perf_counter() - start) * 1000:.0f} ms: {path}")
+    return path
+
+
+def new_authenticated_context(browser, base_url=BASE_URL, **context_options):
+    """A new browser context that starts out logged in as this worker's test account."""
+    return browser.new_context(storage_state=ensure_storage_state(browser, base_url), **context_options)
+
+
+def open_authenticated_page(browser, base_url=BASE_URL, setup=None, **context_options):
+    """Open the app logged in; returns (context, page) with the landing page loaded.
+
+    `setup(context)` runs on each new context before its page opens, e.g. to
+    add init scripts. If the cached session turns out to be stale (the app
+    shows the login form) it is discarded and recreated once.
+    """
+    for attempt in range(2):
+        context = new_authenticated_context(browser, base_url, **context_options)
+        if setup:
+            setup(context)
+        page = context.new_page()
+        page.goto(base_url)
+        state = wait_until(
+            page,
+            """() => document.body.innerText.includes('Sign out') ? 'in'
+                : document.querySelector('input[type="email"]') ? 'out' : false""",
+            "restore session",
+        )
+        if state == "in":
+            return context, page
+        context.close()
+        invalidate_storage_state()
+    raise RuntimeError("Cached auth state was rejected twice")
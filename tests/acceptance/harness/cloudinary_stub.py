@@ -0,0 +1,292 @@
+"""
+Local stand-in for Cloudinary's unsigned upload API.
+
+uploadPhoto() in src/services/storage.ts POSTs multipart form data (file,
+upload_preset, folder) to https://api.cloudinary.com/v1_1/<cloud>/image/upload
+and only reads `secure_url` from the JSON reply. This server implements that
+contract on localhost, keeps the uploaded files on disk and serves them back
+at the returned URL, so the upload path can be exercised offline:
+
+    with CloudinaryStub(latency=0.2, throughput=512 * 1024, error_rate=0.1) as stub:
+        route_cloudinary(context, stub)
+        ...
+        print(stub.uploads)
+
+Shaping knobs:
+    latency      seconds added before every upload response
+    throughput   upload body read rate cap in bytes/s (None = unlimited)
+    error_rate   fraction of uploads answered with HTTP 500 (seeded, reproducible)
+
+route_cloudinary() intercepts the browser's request with page.route and
+forwards it to the stub. The browser has already sent the body by then, so
+XHR upload progress events are not shaped, only the time until the response.
+
+Standalone, e.g. next to with_server.py:
+
+    python tests/acceptance/harness/cloudinary_stub.py --port 9100 --latency 0.1
+"""
+
+import argparse
+import email.parser
+import email.policy
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CLOUDINARY_API = "https://api.cloudinary.com/v1_1/"
+UPLOAD_PATH = re.compile(r"^/v1_1/(?P<cloud>[^/]+)/image/upload/?$")
+ASSET_PATH = re.compile(r"^/(?P<cloud>[^/]+)/image/upload/v\d+/(?P<public_id>.+)$")
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "*",
+}
+FORMATS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/webp": "webp",
+    "image/gif": "gif",
+}
+CHUNK = 64 * 1024
+
+
+def parse_multipart(content_type, body):
+    """Split a multipart/form-data body into ({field: value}, {field: (filename, type, bytes)})."""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields, files = {}, {}
+    if not message.is_multipart():
+        return fields, files
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if not name:
+            continue
+        payload = part.get_payload(decode=True) or b""
+        filename = part.get_filename()
+        if filename is not None:
+            files[name] = (filename, part.get_content_type(), payload)
+        else:
+            fields[name] = payload.decode("utf-8", "replace")
+    return fields, files
+
+
+class CloudinaryStub:
+    """Threaded HTTP server implementing POST /v1_1/<cloud>/image/upload."""
+
+    def __init__(self, root=None, host="127.0.0.1", port=0, latency=0.0, throughput=None,
+                 error_rate=0.0, seed=0):
+        self.root = root or tempfile.mkdtemp(prefix="cloudinary-stub-")
+        self.latency = latency
+        self.throughput = throughput
+        self.error_rate = error_rate
+        self.uploads = []
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset(self):
+        with self._lock:
+            self.uploads.clear()
+            self.failures = 0
+
+    def _should_fail(self):
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _read_body(self, stream, length):
+        """Read the request body, pacing reads to the throughput cap."""
+        chunks = []
+        start = time.perf_counter()
+        received = 0
+        while received < length:
+            chunk = stream.read(min(CHUNK, length - received))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+            if self.throughput:
+                ahead = received / self.throughput - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+        return b"".join(chunks)
+
+    def _store(self, cloud, fields, files):
+        filename, content_type, data = files["file"]
+        digest = hashlib.sha1(data).hexdigest()
+        fmt = FORMATS.get(content_type) or os.path.splitext(filename)[1].lstrip(".").lower() or "jpg"
+        folder = fields.get("folder", "").strip("/")
+        public_id = f"{folder}/{digest[:20]}" if folder else digest[:20]
+        path = os.path.join(self.root, f"{public_id}.{fmt}")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        version = int(time.time())
+        secure_url = f"{self.url}/{cloud}/image/upload/v{version}/{public_id}.{fmt}"
+        return {
+            "asset_id": digest[:32],
+            "public_id": public_id,
+            "version": version,
+            "signature": digest,
+            "format": fmt,
+            "resource_type": "image",
+            "created_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "bytes": len(data),
+            "type": "upload",
+            "folder": folder,
+            "original_filename": os.path.splitext(filename)[0],
+            "url": secure_url,
+            "secure_url": secure_url,
+        }, path
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body, content_type="application/json"):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in CORS_HEADERS.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, status, message):
+                self._reply(status, {"error": {"message": message}})
+
+            def do_OPTIONS(self):
+                self._reply(204, b"", "text/plain")
+
+            def do_GET(self):
+                match = ASSET_PATH.match(self.path.split("?")[0])
+                if not match or ".." in match["public_id"]:
+                    return self._error(404, "Resource not found")
+                path = os.path.join(stub.root, match["public_id"])
+                if not os.path.isfile(path):
+                    return self._error(404, "Resource not found")
+                ext = os.path.splitext(path)[1].lstrip(".")
+                content_type = next((t for t, f in FORMATS.items() if f == ext), "application/octet-stream")
+                with open(path, "rb") as f:
+                    self._reply(200, f.read(), content_type)
+
+            def do_POST(self):
+                start = time.perf_counter()
+                match = UPLOAD_PATH.match(self.path.split("?")[0])
+                length = int(self.headers.get("Content-Length") or 0)
+                body = stub._read_body(self.rfile, length)
+                if not match:
+                    return self._error(404, "Not found")
+
+                fields, files = parse_multipart(self.headers.get("Content-Type", ""), body)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if "file" not in files:
+                    return self._error(400, "Missing required parameter - file")
+                if not fields.get("upload_preset"):
+                    return self._error(400, "Upload preset must be specified when using unsigned upload")
+                if stub._should_fail():
+                    with stub._lock:
+                        stub.failures += 1
+                    return self._error(500, "Injected failure")
+
+                response, path = stub._store(match["cloud"], fields, files)
+                with stub._lock:
+                    stub.uploads.append({
+                        "public_id": response["public_id"],
+                        "path": path,
+                        "request_bytes": length,
+                        "bytes": response["bytes"],
+                        "seconds": time.perf_counter() - start,
+                    })
+                self._reply(200, response)
+
+        return Handler
+
+
+def route_cloudinary(target, stub):
+    """Send a page's or context's Cloudinary API traffic to the stub via page.route."""
+
+    def handle(route):
+        request = route.request
+        if request.method == "OPTIONS":
+            return route.fulfill(status=204, headers=CORS_HEADERS)
+        url = stub.url + "/v1_1/" + request.url[len(CLOUDINARY_API):]
+        response = route.fetch(url=url)
+        route.fulfill(response=response, headers={**response.headers, **CORS_HEADERS})
+
+    target.route(CLOUDINARY_API + "**", handle)
+    return handle
+
+
+def parse_rate(value):
+    """'512K', '2M', '1000000' -> bytes per second."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([KMG]?)B?", value.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid rate: {value}")
+    return int(float(match[1]) * 1024 ** " KMG".index(match[2] or " "))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Cloudinary upload stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--root", help="Directory for uploaded files (default: temp dir)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to each upload")
+    parser.add_argument("--throughput", type=parse_rate, help="Upload rate cap, e.g. 512K or 2M (bytes/s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of uploads failing with 500")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stub = CloudinaryStub(args.root, args.host, args.port, args.latency, args.throughput,
+                          args.error_rate, args.seed)
+    print(f"Cloudinary stub on {stub.url}, files in {stub.root}", flush=True)
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Toast / dialog / alert events pushed from the page to Python as they happen.
+
+A MutationObserver installed at context creation watches for
+
+    toast    Sonner toasts ([data-sonner-toast], `type` = data-type:
+             success / error / info / loading ...)
+    alert    [role="alert"]
+    dialog   [role="dialog"], [role="alertdialog"], <dialog open>
+
+and reports each one through an exposed binding when it is added, when
+its type or text changes (a loading toast turning into success) and when
+it is removed. Nothing is scraped afterwards, so a toast that lives for
+a few hundred milliseconds between two checks is still recorded.
+
+    events = DomEvents()
+    context = browser.new_context()
+    events.install(context)
+    ...
+    mark = events.mark()
+    page.click("text=儲存")
+    toast = events.wait_for("toast", type="success", since=mark)
+
+Each event is a dict: kind, action (added/updated/removed), type, text,
+t (page clock, epoch ms), lifetime_ms (on removal) and url. Native
+window.alert/confirm dialogs are not DOM and are not covered here;
+Playwright's page.on("dialog") handles those.
+"""
+
+import time
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from harness.waits import DEFAULT_TIMEOUT, timed_wait
+
+BINDING = "__traveldotDomEvent"
+POLL_MS = 20
+
+DOM_EVENTS_INIT_JS = """
+(() => {
+    if (window.__domEventsInstalled) return;
+    window.__domEventsInstalled = true;
+    const KINDS = [
+        ['toast', '[data-sonner-toast]'],
+        ['alert', '[role="alert"]'],
+        ['dialog', '[role="dialog"], [role="alertdialog"], dialog[open]'],
+    ];
+    const live = new Map();  // element -> { kind, type, text, added }
+    const now = () => performance.timeOrigin + performance.now();
+    const describe = (kind, el) => ({
+        kind,
+        type: el.getAttribute('data-type') || el.getAttribute('role') || el.tagName.toLowerCase(),
+        text: (el.textContent || '').trim().replace(/\\s+/g, ' ').slice(0, 500),
+    });
+    const emit = (action, state, extra) => {
+        const send = window.__traveldotDomEvent;
+        if (send) send({ action, kind: state.kind, type: state.type, text: state.text, t: now(), ...extra });
+    };
+
+    // Diff the currently matching elements against the last pass
+    const reconcile = () => {
+        const current = new Map();
+        for (const [kind, selector] of KINDS) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (!current.has(el)) current.set(el, describe(kind, el));
+            }
+        }
+        for (const [el, state] of current) {
+            const previous = live.get(el);
+            if (!previous) {
+                live.set(el, { ...state, added: now() });
+                emit('added', state);
+            } else if (previous.type !== state.type || previous.text !== state.text) {
+                live.set(el, { ...state, added: previous.added });
+                emit('updated', state);
+            }
+        }
+        for (const [el, state] of live) {
+            if (!current.has(el)) {
+                live.delete(el);
+                emit('removed', state, { lifetime_ms: Math.round(now() - state.added) });
+            }
+        }
+    };
+    new MutationObserver(reconcile).observe(document, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: ['data-type', 'role', 'open'],
+    });
+    reconcile();
+})();
+"""
+
+
+class DomEvents:
+    """Collects DOM events from every page of the contexts it is installed in."""
+
+    def __init__(self, verbose=True):
+        self.events = []
+        self.verbose = verbose
+        self._contexts = []
+
+    def install(self, context):
+        """Expose the binding and observer to `context` (also its already open pages)."""
+        context.expose_binding(BINDING, self._on_event)
+        context.add_init_script(DOM_EVENTS_INIT_JS)
+        for page in context.pages:
+            page.evaluate(DOM_EVENTS_INIT_JS)
+        self._contexts.append(context)
+        return self
+
+    def _on_event(self, source, event):
+        page = source.get("page")
+        event["url"] = page.url if page else None
+        self.events.append(event)
+        if self.verbose:
+            print(f"  [{event['kind']} {event['action']}] {event['type']}: {event['text'][:80]}")
+
+    def _page(self):
+        for context in reversed(self._contexts):
+            if context.pages:
+                return context.pages[0]
+        raise RuntimeError("DomEvents is not installed in a context with an open page")
+
+    def mark(self):
+        """Position to pass as `since` to only look at events from now on."""
+        return len(self.events)
+
+    def find(self, kind, action="added", type=None, text=None, since=0):
+        """Events of `kind` whose type matches and whose text contains `text`."""
+        return [
+            e for e in self.events[since:]
+            if e["kind"] == kind
+            and (action is None or e["action"] == action)
+            and (type is None or e["type"] == type)
+            and (text is None or text in e["text"])
+        ]
+
+    def texts(self, kind, since=0):
+        """Distinct texts of `kind` shown since `since`, in order of appearance."""
+        seen = []
+        for event in self.find(kind, action=None, since=since):
+            if event["action"] != "removed" and event["text"] and event["text"] not in seen:
+                seen.append(event["text"])
+        return seen
+
+    def wait_for(self, kind, action="added", type=None, text=None, since=0, timeout=DEFAULT_TIMEOUT):
+        """The first matching event at or after `since`, waiting for it if needed.
+
+        Raises Playwright's TimeoutError when none arrives within `timeout` ms.
+        """
+        label = " ".join(str(p) for p in (kind, type, action, repr(text) if text else None) if p)
+        deadline = time.perf_counter() + timeout / 1000
+        with timed_wait(label):
+            while True:
+                found = self.find(kind, action, type, text, since)
+                if found:
+                    return found[0]
+                if time.perf_counter() >= deadline:
+                    raise PlaywrightTimeoutError(f"No {label} event within {timeout} ms")
+                # Lets Playwright dispatch pending binding calls
+                self._page().wait_for_timeout(POLL_MS)
@@ -0,0 +1,308 @@
+"""
+Local Firebase Auth + Firestore emulators for the acceptance suite.
+
+The app talks to the emulators when the dev server is started with
+
+    VITE_USE_FIREBASE_EMULATOR=true VITE_FIREBASE_PROJECT_ID=demo-traveldot npm run dev
+
+(see src/services/firebase.ts; the emulator ports come from firebase.json).
+A "demo-" project ID makes the Firebase SDK and CLI refuse to touch any real
+project, so this mode needs no network and no credentials.
+
+    emulator = FirebaseEmulator().start()      # attaches if already running
+    emulator.reset()                           # wipe all accounts and documents
+    uid = emulator.ensure_user(email, password)
+    trip_id = emulator.seed_trip(uid, "Tokyo")
+    emulator.seed_place(uid, trip_id, "Shibuya", 35.659, 139.700)
+    emulator.stop()
+
+All Firestore calls use the emulator's "Bearer owner" token, which bypasses
+firestore.rules, and the REST endpoints documented at
+https://firebase.google.com/docs/emulator-suite/connect_firestore.
+"""
+
+import json
+import os
+import secrets
+import signal
+import string
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from datetime import date, datetime, timezone
+
+PROJECT_ID = os.environ.get("FIREBASE_EMULATOR_PROJECT", "demo-traveldot")
+AUTH_HOST = os.environ.get("FIREBASE_AUTH_EMULATOR_HOST", "127.0.0.1:9099")
+FIRESTORE_HOST = os.environ.get("FIRESTORE_EMULATOR_HOST", "127.0.0.1:8080")
+START_COMMAND = ["firebase", "emulators:start", "--only", "auth,firestore", "--project", PROJECT_ID]
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+
+ID_ALPHABET = string.ascii_letters + string.digits
+
+
+def auto_id():
+    """A 20-character document ID like Firestore's client-side auto IDs."""
+    return "".join(secrets.choice(ID_ALPHABET) for _ in range(20))
+
+
+def to_value(value):
+    """Encode a Python value as a Firestore REST Value."""
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return {"timestampValue": value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")}
+    if isinstance(value, date):
+        return to_value(datetime(value.year, value.month, value.day, tzinfo=timezone.utc))
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": to_fields(value)}}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [to_value(v) for v in value]}}
+    raise TypeError(f"Cannot store {type(value).__name__} in Firestore: {value!r}")
+
+
+def to_fields(data):
+    return {key: to_value(value) for key, value in data.items()}
+
+
+def from_value(value):
+    """Decode a Firestore REST Value (timestamps stay ISO strings)."""
+    kind, inner = next(iter(value.items()))
+    if kind == "integerValue":
+        return int(inner)
+    if kind == "mapValue":
+        return {k: from_value(v) for k, v in inner.get("fields", {}).items()}
+    if kind == "arrayValue":
+        return [from_value(v) for v in inner.get("values", [])]
+    return inner
+
+
+def stop_process_group(pid, timeout=15):
+    """SIGINT the emulators' process group led by `pid`, SIGKILL it after `timeout`."""
+    try:
+        os.killpg(pid, signal.SIGINT)
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            os.killpg(pid, 0)
+            time.sleep(0.25)
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # Exited
+
+
+class EmulatorError(RuntimeError):
+    pass
+
+
+class FirebaseEmulator:
+    """Start/attach to the emulators and manage their state over REST."""
+
+    def __init__(self, project_id=PROJECT_ID, auth_host=AUTH_HOST, firestore_host=FIRESTORE_HOST):
+        self.project_id = project_id
+        self.auth_host = auth_host
+        self.firestore_host = firestore_host
+        self.process = None
+
+    # ---- lifecycle -------------------------------------------------------
+
+    @property
+    def documents_url(self):
+        return (f"http://{self.firestore_host}/v1/projects/{self.project_id}"
+                "/databases/(default)/documents")
+
+    def document_name(self, path):
+        return f"projects/{self.project_id}/databases/(default)/documents/{path}"
+
+    def is_running(self):
+        for host in (self.auth_host, self.firestore_host):
+            try:
+                urllib.request.urlopen(f"http://{host}/", timeout=1).close()
+            except urllib.error.HTTPError:
+                pass  # Answered, so it is up
+            except OSError:
+                return False
+        return True
+
+    def start(self, timeout=60):
+        """Attach to running emulators, or start them with the Firebase CLI."""
+        if self.is_running():
+            return self
+        print(f"  Starting Firebase emulators: {' '.join(START_COMMAND)}")
+        self.process = subprocess.Popen(
+            START_COMMAND, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.time() + timeout
+        while not self.is_running():
+            if self.process.poll() is not None:
+                raise EmulatorError(f"Firebase emulators exited with code {self.process.returncode}")
+            if time.time() > deadline:
+                self.stop()
+                raise EmulatorError(f"Firebase emulators not ready after {timeout}s")
+            time.sleep(0.25)
+        return self
+
+    def stop(self):
+        """Stop the emulators if this instance started them."""
+        if not self.process:
+            return
+        try:
+            os.killpg(self.process.pid, signal.SIGINT)
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+            self.process.wait()
+        except ProcessLookupError:
+            pass
+        self.process = None
+
+    # ---- REST ------------------------------------------------------------
+
+    def request(self, method, url, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(url, data=data, method=method, headers={
+            "Content-Type": "application/json", **(headers or {}),
+        })
+        try:
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                payload = resp.read()
+        except urllib.error.HTTPError as e:
+            raise EmulatorError(f"{method} {url} -> HTTP {e.code}: {e.read().decode(errors='replace')}")
+        return json.loads(payload) if payload else {}
+
+    def firestore(self, method, path, body=None):
+        url = self.documents_url + (path if path.startswith(":") else f"/{path}" if path else "")
+        return self.request(method, url, body, {"Authorization": "Bearer owner"})
+
+    def reset(self):
+        """Delete every emulator account and Firestore document."""
+        self.reset_firestore()
+        self.reset_auth()
+
+    def reset_firestore(self):
+        self.request("DELETE", self.documents_url.replace("/v1/", "/emulator/v1/", 1))
+
+    def reset_auth(self):
+        self.request("DELETE", f"http://{self.auth_host}/emulator/v1/projects/{self.project_id}/accounts")
+
+    # ---- auth ------------------------------------------------------------
+
+    def _identity(self, action, body):
+        url = f"http://{self.auth_host}/identitytoolkit.googleapis.com/v1/accounts:{action}?key=emulator"
+        return self.request("POST", url, {**body, "returnSecureToken": True})
+
+    def create_user(self, email, password):
+        return self._identity("signUp", {"email": email, "password": password})["localId"]
+
+    def ensure_user(self, email, password):
+        """UID of the account, creating it if needed."""
+        try:
+            return self._identity("signInWithPassword", {"email": email, "password": password})["localId"]
+        except EmulatorError:
+            return self.create_user(email, password)
+
+    # ---- Firestore -------------------------------------------------------
+
+    def commit(self, writes):
+        """Apply REST Write objects atomically (documents:commit)."""
+        return self.firestore("POST", ":commit", {"writes": writes})
+
+    def batch_write(self, writes):
+        """Apply up to 500 REST Write objects non-atomically (documents:batchWrite).
+
+        Faster than commit() for bulk loads; raises if any write failed.
+        """
+        result = self.firestore("POST", ":batchWrite", {"writes": writes})
+        failed = [s for s in result.get("status", []) if s.get("code")]
+        if failed:
+            raise EmulatorError(f"{len(failed)}/{len(writes)} writes failed, e.g. {failed[0]}")
+        return result
+
+    def update_write(self, path, data):
+        """A REST Write that sets the document at `path` to `data`."""
+        return {"update": {"name": self.document_name(path), "fields": to_fields(data)}}
+
+    def set_document(self, path, data):
+        self.firestore("PATCH", path, {"fields": to_fields(data)})
+
+    def get_document(self, path):
+        doc = self.firestore("GET", path)
+        return {key: from_value(value) for key, value in doc.get("fields", {}).items()}
+
+    def list_documents(self, collection_path):
+        """Document paths (relative to the database root) in a collection."""
+        paths, token = [], None
+        prefix = self.document_name("")
+        while True:
+            query = "?pageSize=300&mask.fieldPaths=__name__" + (f"&pageToken={token}" if token else "")
+            page = self.firestore("GET", collection_path + query)
+            paths += [doc["name"][len(prefix):] for doc in page.get("documents", [])]
+            token = page.get("nextPageToken")
+            if not token:
+                return paths
+
+    def clear_user_data(self, uid):
+        """Delete a user's trips and places without touching other workers' users."""
+        deletes = []
+        for trip in self.list_documents(f"users/{uid}/trips"):
+            deletes += self.list_documents(f"{trip}/places") + [trip]
+        for start in range(0, len(deletes), 500):
+            self.batch_write([{"delete": self.document_name(p)} for p in deletes[start:start + 500]])
+        return len(deletes)
+
+    def seed_trip(self, uid, title, start_date=None, end_date=None, description="", trip_id=None, **extra):
+        """Create users/{uid}/trips/{id} with the fields createTrip() writes; returns the id."""
+        trip_id = trip_id or auto_id()
+        now = datetime.now(timezone.utc)
+        self.set_document(f"users/{uid}/trips/{trip_id}", {
+            "title": title,
+            "description": description,
+            "startDate": start_date or now,
+            "endDate": end_date or start_date or now,
+            "coverImage": None,
+            "placesCount": 0,
+            "createdAt": now,
+            "updatedAt": now,
+            **extra,
+        })
+        return trip_id
+
+    def place_document(self, trip_id, name, lat, lng, **extra):
+        """Fields of a place as createPlace() writes them."""
+        now = datetime.now(timezone.utc)
+        return {
+            "tripId": trip_id,
+            "name": name,
+            "coordinates": {"lat": float(lat), "lng": float(lng)},
+            "address": "",
+            "visitedDate": now,
+            "content": {"text": "", "media": []},
+            "tags": [],
+            "isPublic": False,
+            "createdAt": now,
+            "updatedAt": now,
+            **extra,
+        }
+
+    def seed_place(self, uid, trip_id, name, lat, lng, place_id=None, **extra):
+        """Create a place and bump the trip's placesCount in one commit; returns the id."""
+        place_id = place_id or auto_id()
+        trip_path = f"users/{uid}/trips/{trip_id}"
+        self.commit([
+            self.update_write(f"{trip_path}/places/{place_id}", self.place_document(trip_id, name, lat, lng, **extra)),
+            {"transform": {
+                "document": self.document_name(trip_path),
+                "fieldTransforms": [{"fieldPath": "placesCount", "increment": {"integerValue": "1"}}],
+            }},
+        ])
+        return place_id
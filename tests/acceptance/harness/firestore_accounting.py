@@ -0,0 +1,355 @@
+"""
+Firestore operation accounting per scenario step.
+
+Records the page's Firestore traffic over CDP and attributes document
+reads, writes and bytes to the step that was running when it happened:
+
+    accounting = FirestoreAccounting(page)      # before the traffic to count
+    with accounting.step("open trip map"):
+        page.reload()
+        wait_for_element(page, MAP_SELECTOR)
+    with accounting.step("save place with 1 photo"):
+        ...
+    report = accounting.report()                # per-step counts + fan-out flags
+    accounting.print_report()
+
+The web SDK talks to Firestore over WebChannel (…/Firestore/Listen/channel,
+…/Firestore/Write/channel), so the counts come from the channel payloads:
+
+    reads     documentChange entries on the Listen stream (documents sent to
+              the client, which is what Firestore bills as reads), plus
+              documents returned by REST batchGet/runQuery calls
+    writes    Write entries in Write-stream requests and REST commits; a
+              write with field transforms (increment) is still one write
+    deletes   the subset of writes that are deletes
+    listens   addTarget requests (a getDocs/getDoc/onSnapshot each add one)
+
+Leaving a step waits until the channels have been quiet for `quiet_ms`, so
+listener updates caused by the step's own writes are counted in it.
+Traffic outside any step is kept under "(between steps)".
+
+Fan-out flags mark steps whose cost grows with the data, not with the
+action, e.g. deleteTrip() reading every place with getDocs() and deleting
+them one by one in a batch. Chromium only (needs CDP streaming of
+response bodies).
+"""
+
+import base64
+import codecs
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from urllib.parse import parse_qs
+
+CHANNEL_RE = re.compile(r"google\.firestore\.v1\.Firestore/(Listen|Write)/channel")
+REST_RE = re.compile(r"/v1/projects/[^/]+/databases/[^/]+/documents[^?]*:(commit|batchGet|runQuery|runAggregationQuery)")
+IDLE_STEP = "(between steps)"
+
+# A step reading or deleting at least this many documents of one collection
+# is flagged as fan-out
+FANOUT_MIN = 20
+
+
+def collection_of(name):
+    """'projects/p/databases/(default)/documents/users/u/trips/t/places/x' -> 'places'."""
+    path = name.split("/documents/", 1)[-1].split("/")
+    return path[-2] if len(path) >= 2 else path[0]
+
+
+def query_label(target):
+    """A readable description of a Listen addTarget: 'query places' / 'get trips'."""
+    if "query" in target:
+        query = target["query"].get("structuredQuery", {})
+        collections = ",".join(c.get("collectionId", "?") for c in query.get("from", []))
+        return f"query {collections}" + (f" limit {query['limit']}" if "limit" in query else "")
+    documents = target.get("documents", {}).get("documents", [])
+    return "get " + ",".join(sorted({collection_of(d) for d in documents}))
+
+
+def iter_messages(text, pos=0):
+    """Parse WebChannel frames ('<length>\\n<json>' repeated) from text[pos:].
+
+    Yields (message, end) pairs; stops at the first incomplete frame so the
+    caller can keep the remainder for the next chunk.
+    """
+    decoder = json.JSONDecoder()
+    while True:
+        newline = text.find("\n", pos)
+        if newline < 0 or not text[pos:newline].strip().isdigit():
+            return
+        try:
+            message, end = decoder.raw_decode(text, newline + 1)
+        except ValueError:
+            return
+        yield message, end
+        pos = end
+
+
+def _walk(value):
+    """Every dict inside a decoded WebChannel message."""
+    if isinstance(value, dict):
+        yield value
+        for inner in value.values():
+            yield from _walk(inner)
+    elif isinstance(value, list):
+        for inner in value:
+            yield from _walk(inner)
+
+
+class StepCost:
+    def __init__(self, name, fanout_min=FANOUT_MIN):
+        self.name = name
+        self.fanout_min = fanout_min
+        self.started = time.perf_counter()
+        self.duration_ms = 0
+        self.reads = Counter()
+        self.writes = Counter()
+        self.deletes = Counter()
+        self.listens = Counter()
+        self.batch_sizes = []
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def summary(self):
+        return {
+            "step": self.name,
+            "duration_ms": round(self.duration_ms),
+            "reads": sum(self.reads.values()),
+            "writes": sum(self.writes.values()),
+            "deletes": sum(self.deletes.values()),
+            "listens": sum(self.listens.values()),
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "by_collection": {
+                name: {"reads": self.reads[name], "writes": self.writes[name], "deletes": self.deletes[name]}
+                for name in sorted(set(self.reads) | set(self.writes))
+            },
+            "targets": dict(self.listens),
+            "largest_write_batch": max(self.batch_sizes, default=0),
+            "flags": self.flags(),
+        }
+
+    def flags(self):
+        fanout_min = self.fanout_min
+        flags = []
+        for name, deleted in self.deletes.items():
+            if deleted >= fanout_min and self.reads[name] >= deleted:
+                flags.append(f"read-then-delete: {self.reads[name]} {name} read to delete {deleted} "
+                             f"(client-side cascade, cost grows with the collection)")
+        for name, read in self.reads.items():
+            if read >= fanout_min and not self.deletes[name]:
+                flags.append(f"unbounded-read: {read} {name} documents read in one step")
+        if max(self.batch_sizes, default=0) >= fanout_min:
+            flags.append(f"large-batch: a single write request carried {max(self.batch_sizes)} writes")
+        for label, count in self.listens.items():
+            if count > 1:
+                flags.append(f"repeated-listen: '{label}' subscribed {count} times")
+        return flags
+
+
+class FirestoreAccounting:
+    """Per-step Firestore reads/writes/bytes for one page, recorded over CDP."""
+
+    def __init__(self, page, quiet_ms=500, fanout_min=FANOUT_MIN):
+        self.page = page
+        self.quiet_ms = quiet_ms
+        self.fanout_min = fanout_min
+        self.steps = [StepCost(IDLE_STEP, fanout_min)]
+        self._current = self.steps[0]
+        self._requests = {}
+        self._last_activity = time.perf_counter()
+        self._session = page.context.new_cdp_session(page)
+        self._session.on("Network.requestWillBeSent", self._on_request)
+        self._session.on("Network.responseReceived", self._on_response)
+        self._session.on("Network.dataReceived", self._on_data)
+        self._session.on("Network.loadingFinished", self._on_finished)
+        self._session.send("Network.enable")
+
+    # ---- steps -----------------------------------------------------------
+
+    @contextmanager
+    def step(self, name, settle=True):
+        """Attribute Firestore traffic to `name` until the block (and the traffic) ends."""
+        cost = StepCost(name, self.fanout_min)
+        self.steps.append(cost)
+        self._current = cost
+        try:
+            yield cost
+            if settle:
+                self.settle()
+        finally:
+            cost.duration_ms = (time.perf_counter() - cost.started) * 1000
+            self._current = self.steps[0]
+
+    def settle(self, timeout=10):
+        """Wait until no Firestore traffic has been seen for quiet_ms."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if (time.perf_counter() - self._last_activity) * 1000 >= self.quiet_ms:
+                return True
+            self.page.wait_for_timeout(50)  # lets Playwright dispatch the CDP events
+        return False
+
+    # ---- CDP events --------------------------------------------------------
+
+    def _touch(self, cost, sent=0, received=0):
+        cost.bytes_sent += sent
+        cost.bytes_received += received
+        self._last_activity = time.perf_counter()
+
+    def _on_request(self, event):
+        url = event["request"]["url"]
+        channel = CHANNEL_RE.search(url)
+        rest = REST_RE.search(url)
+        if not channel and not rest:
+            return
+        body = event["request"].get("postData")
+        if body is None and event["request"].get("hasPostData"):
+            try:
+                body = self._session.send("Network.getRequestPostData", {"requestId": event["requestId"]})["postData"]
+            except Exception:
+                body = ""
+        body = body or ""
+        cost = self._current
+        self._requests[event["requestId"]] = {
+            "kind": channel.group(1) if channel else rest.group(1),
+            "decoder": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "buffer": "",
+            "received": 0,
+            "streamed": False,
+        }
+        cost.requests += 1
+        self._touch(cost, sent=len(body.encode()))
+        if channel:
+            self._count_channel_request(cost, channel.group(1), body)
+        elif rest.group(1) == "commit":
+            self._count_writes(cost, json.loads(body or "{}").get("writes", []))
+
+    def _count_channel_request(self, cost, kind, body):
+        # Forward channel: 'count=N&ofs=..&req0___data__=<json>&req1___data__=...'
+        fields = parse_qs(body)
+        for key in sorted(k for k in fields if k.endswith("___data__")):
+            try:
+                message = json.loads(fields[key][0])
+            except ValueError:
+                continue
+            if kind == "Write":
+                self._count_writes(cost, message.get("writes", []))
+            elif "addTarget" in message:
+                cost.listens[query_label(message["addTarget"])] += 1
+
+    def _count_writes(self, cost, writes):
+        if not writes:
+            return
+        cost.batch_sizes.append(len(writes))
+        for write in writes:
+            if "delete" in write:
+                name = collection_of(write["delete"])
+                cost.deletes[name] += 1
+            else:
+                target = write.get("update") or write.get("transform") or {}
+                name = collection_of(target.get("name") or target.get("document") or "?")
+            cost.writes[name] += 1
+
+    def _on_response(self, event):
+        request = self._requests.get(event["requestId"])
+        if request is None:
+            return
+        # Listen/Write backchannels stay open; stream their bodies as they arrive
+        try:
+            buffered = self._session.send("Network.streamResourceContent", {"requestId": event["requestId"]})
+            request["streamed"] = True
+            self._feed(request, base64.b64decode(buffered.get("bufferedData", "")))
+        except Exception:
+            pass  # Not a streamable response or unsupported; read at loadingFinished
+
+    def _on_data(self, event):
+        request = self._requests.get(event["requestId"])
+        if request is None:
+            return
+        request["received"] += event.get("encodedDataLength", 0)
+        self._touch(self._current, received=event.get("encodedDataLength", 0))
+        if request["streamed"] and event.get("data"):
+            self._feed(request, base64.b64decode(event["data"]))
+
+    def _on_finished(self, event):
+        request = self._requests.pop(event["requestId"], None)
+        if request is None:
+            return
+        extra = event.get("encodedDataLength", 0) - request["received"]
+        self._touch(self._current, received=max(extra, 0))
+        if not request["streamed"]:
+            try:
+                body = self._session.send("Network.getResponseBody", {"requestId": event["requestId"]})
+            except Exception:
+                return
+            data = body["body"]
+            self._feed(request, base64.b64decode(data) if body.get("base64Encoded") else data.encode())
+
+    # ---- response bodies ---------------------------------------------------
+
+    def _feed(self, request, data):
+        # Backchannels outlive steps: responses count for the step running when they arrive
+        cost = self._current
+        request["buffer"] += request["decoder"].decode(data)
+        if request["kind"] in ("batchGet", "runQuery"):
+            return self._count_rest_reads(request, cost)
+        consumed = 0
+        for message, end in iter_messages(request["buffer"]):
+            consumed = end
+            for item in _walk(message):
+                if "documentChange" in item:
+                    cost.reads[collection_of(item["documentChange"]["document"]["name"])] += 1
+        request["buffer"] = request["buffer"][consumed:]
+
+    def _count_rest_reads(self, request, cost):
+        try:
+            results = json.loads(request["buffer"])
+        except ValueError:
+            return  # Incomplete; wait for the rest of the body
+        for item in results if isinstance(results, list) else [results]:
+            document = item.get("found") or item.get("document")
+            if document:
+                cost.reads[collection_of(document["name"])] += 1
+        request["buffer"] = ""
+
+    # ---- report --------------------------------------------------------------
+
+    def report(self):
+        steps = [s.summary() for s in self.steps if s.name != IDLE_STEP]
+        idle = self.steps[0].summary()
+        totals = defaultdict(int)
+        for step in steps + [idle]:
+            for key in ("reads", "writes", "deletes", "listens", "requests", "bytes_sent", "bytes_received"):
+                totals[key] += step[key]
+        return {"steps": steps, "between_steps": idle, "totals": dict(totals)}
+
+    def print_report(self, report=None):
+        report = report or self.report()
+        print(f"\n  {'step':<36} {'reads':>6} {'writes':>6} {'deletes':>7} {'listens':>7} {'KB in':>7} {'KB out':>7}")
+        for step in report["steps"] + [report["between_steps"]]:
+            print(f"  {step['step'][:36]:<36} {step['reads']:>6} {step['writes']:>6} {step['deletes']:>7} "
+                  f"{step['listens']:>7} {step['bytes_received'] / 1024:>7.1f} {step['bytes_sent'] / 1024:>7.1f}")
+            for flag in step["flags"]:
+                print(f"      ! {flag}")
+
+    def detach(self):
+        self._session.detach()
+
+
+def over_budget(report, budgets):
+    """Messages for steps exceeding {step: {"reads": n, "writes": n, ...}} ceilings."""
+    steps = {step["step"]: step for step in report["steps"]}
+    problems = []
+    for name, limits in budgets.items():
+        if name not in steps:
+            problems.append(f"{name}: step was not recorded")
+            continue
+        for metric, limit in limits.items():
+            if steps[name][metric] > limit:
+                problems.append(f"{name}: {steps[name][metric]} {metric} (budget {limit})")
+    return problems
@@ -0,0 +1,274 @@
+"""
+Deterministic photo corpora for the upload scenarios and benchmarks.
+
+Images look roughly like photos (sky/ground gradients, a wavy horizon,
+texture and sensor-like noise), are synthesized with vectorized NumPy and
+encoded by Pillow as JPEG, PNG or WebP. Each carries EXIF DateTimeOriginal
+and GPS tags, the way camera-roll uploads do.
+
+    paths = generate_corpus(count=50, width=4000, height=3000, size_mb=(2, 12))
+
+A corpus is cached on disk under a hash of its parameters, so asking for
+the same corpus again only reads the manifest. Generation holds a file
+lock, so xdist workers asking for the same corpus build it once.
+
+With size_mb, each image's JPEG/WebP noise level (and, only if needed,
+quality above a camera-like 92) is tuned so the file lands near a target
+drawn from that range. PNG is lossless and not size-fitted; it uses
+`noise` as given.
+
+Pre-generate from the command line:
+
+    python tests/acceptance/harness/image_corpus.py --count 200 --size-mb 2 12
+
+Needs numpy and Pillow.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+from PIL import Image, ImageChops
+from PIL.TiffImagePlugin import IFDRational
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness.locks import file_lock  # noqa: E402
+
+# Bump when the synthesis changes so stale caches are not reused
+GENERATOR_VERSION = 1
+CORPUS_DIR = os.environ.get(
+    "ACCEPTANCE_CORPUS_DIR", os.path.join(tempfile.gettempdir(), "traveldot-corpus")
+)
+FORMATS = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+NOISE_TILE = 512
+SCALE = 4
+QUALITY = 92
+MAX_AMPLITUDE = 96
+
+# EXIF tags / IFDs
+EXIF_IFD = 0x8769
+GPS_IFD = 0x8825
+TAG_MAKE, TAG_MODEL, TAG_DATETIME = 0x010F, 0x0110, 0x0132
+TAG_DATETIME_ORIGINAL = 0x9003
+
+
+def synthesize_base(width, height, rng):
+    """Smooth photo-like RGB content (sky, wavy horizon, ground texture) as a PIL image.
+
+    Drawn at a quarter of the resolution with NumPy and upscaled by Pillow,
+    which is indistinguishable for content this smooth and much faster.
+    """
+    w, h = max(width // SCALE, 1), max(height // SCALE, 1)
+    y = np.linspace(0.0, 1.0, h, dtype=np.float32)[:, None, None]
+    x = np.linspace(0.0, 1.0, w, dtype=np.float32)[None, :, None]
+
+    sky_top, sky_bottom, ground_top, ground_bottom = rng.uniform(20, 235, (4, 3)).astype(np.float32)
+    phase, freq = rng.uniform(0, 2 * np.pi), rng.uniform(1, 6)
+    horizon = 0.45 + 0.08 * np.sin(2 * np.pi * freq * x + phase)
+    sky = sky_top + (sky_bottom - sky_top) * np.clip(y / horizon, 0, 1)
+    ground = ground_top + (ground_bottom - ground_top) * np.clip((y - horizon) / (1 - horizon), 0, 1)
+    # Blocky texture (buildings/foliage-ish) below the horizon
+    ground += 24 * np.sin(2 * np.pi * rng.uniform(20, 80) * x) * np.cos(2 * np.pi * rng.uniform(10, 40) * y)
+
+    small = np.clip(np.where(y < horizon, sky, ground), 0, 255).astype(np.uint8)
+    return Image.fromarray(small, "RGB").resize((width, height), Image.BILINEAR)
+
+
+def noise_tile(rng):
+    """Unit sensor noise in [-1, 1], tiled over the image by add_noise()."""
+    return rng.uniform(-1.0, 1.0, (NOISE_TILE, NOISE_TILE, 3)).astype(np.float32)
+
+
+def add_noise(base, tile, amplitude):
+    """base + amplitude * tiled noise, clipped, via Pillow's C arithmetic."""
+    if amplitude <= 0:
+        return base
+    width, height = base.size
+    reps = (-(-height // NOISE_TILE), -(-width // NOISE_TILE), 1)
+    noise = np.tile((128 + amplitude * tile).astype(np.uint8), reps)[:height, :width]
+    return ImageChops.add(base, Image.fromarray(noise, "RGB"), scale=1.0, offset=-128)
+
+
+def _dms(value):
+    value = abs(value)
+    degrees = int(value)
+    minutes = int((value - degrees) * 60)
+    seconds = round((value - degrees - minutes / 60) * 3600, 4)
+    return (IFDRational(degrees, 1), IFDRational(minutes, 1), IFDRational(int(seconds * 10000), 10000))
+
+
+def make_exif(taken_at, lat, lng):
+    exif = Image.Exif()
+    stamp = taken_at.strftime("%Y:%m:%d %H:%M:%S")
+    exif[TAG_MAKE] = "TravelDot"
+    exif[TAG_MODEL] = "Synthetic Camera"
+    exif[TAG_DATETIME] = stamp
+    exif.get_ifd(EXIF_IFD)[TAG_DATETIME_ORIGINAL] = stamp
+    gps = exif.get_ifd(GPS_IFD)
+    gps[0] = b"\x02\x03\x00\x00"  # GPSVersionID
+    gps[1] = "N" if lat >= 0 else "S"
+    gps[2] = _dms(lat)
+    gps[3] = "E" if lng >= 0 else "W"
+    gps[4] = _dms(lng)
+    return exif.tobytes()
+
+
+def encode(image, fmt, exif, quality=QUALITY):
+    out = io.BytesIO()
+    if fmt == "jpeg":
+        image.save(out, format="JPEG", quality=quality, exif=exif)
+    elif fmt == "webp":
+        image.save(out, format="WEBP", quality=quality, method=0, exif=exif)
+    else:
+        image.save(out, format="PNG", compress_level=1, exif=exif)
+    return out.getvalue()
+
+
+def fit_size(base, tile, fmt, target_bytes):
+    """(noise amplitude, quality) whose encoded size is closest to target_bytes.
+
+    Works on a 1024x768 crop: sensor noise dominates the bits per pixel, so
+    a crop predicts the full image well at a fraction of the encode cost.
+    Quality only goes above 92 when even maximal noise is too small.
+    """
+    crop = base.crop((0, 0, min(base.width, 1024), min(base.height, 768)))
+    target_bpp = target_bytes / (base.width * base.height)
+
+    def bpp(amplitude, quality):
+        return len(encode(add_noise(crop, tile, amplitude), fmt, b"", quality)) / (crop.width * crop.height)
+
+    for quality in (QUALITY, 96, 98):
+        if bpp(MAX_AMPLITUDE, quality) >= target_bpp:
+            break
+    low, high = 0.0, MAX_AMPLITUDE
+    for _ in range(6):
+        amplitude = (low + high) / 2
+        if bpp(amplitude, quality) > target_bpp:
+            high = amplitude
+        else:
+            low = amplitude
+    return (low + high) / 2, quality
+
+
+def corpus_key(params):
+    blob = json.dumps({**params, "version": GENERATOR_VERSION}, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+
+def _generate_one(index, directory, params):
+    rng = np.random.default_rng([params["seed"], index])
+    fmt = params["formats"][index % len(params["formats"])]
+    low, high = params["size_mb"] or (0, 0)
+    target = int(rng.uniform(low, high) * 1024 * 1024) if high else None
+    base = synthesize_base(params["width"], params["height"], rng)
+    tile = noise_tile(rng)
+
+    lat = params["gps_center"][0] + rng.normal(0, params["gps_spread"])
+    lng = params["gps_center"][1] + rng.normal(0, params["gps_spread"])
+    taken_at = datetime.fromisoformat(params["start_time"]) + timedelta(minutes=int(rng.integers(0, 60 * 24 * 14)))
+
+    # PNG is lossless: noise only makes it bigger, so it is not size-fitted
+    if target and fmt != "png":
+        amplitude, quality = fit_size(base, tile, fmt, target)
+    else:
+        amplitude, quality = params["noise"], QUALITY
+    data = encode(add_noise(base, tile, amplitude), fmt, make_exif(taken_at, lat, lng), quality)
+    path = os.path.join(directory, f"photo_{index:04d}{FORMATS[fmt]}")
+    with open(path, "wb") as f:
+        f.write(data)
+    return {
+        "path": path,
+        "format": fmt,
+        "bytes": len(data),
+        "width": params["width"],
+        "height": params["height"],
+        "lat": round(lat, 6),
+        "lng": round(lng, 6),
+        "taken_at": taken_at.isoformat(),
+        "noise": round(amplitude, 2),
+        "quality": quality,
+    }
+
+
+def generate_corpus(count, width=4000, height=3000, formats=("jpeg",), size_mb=None, seed=0,
+                    gps_center=(25.0330, 121.5654), gps_spread=0.05,
+                    start_time="2024-05-01T09:00:00", noise=12, cache_dir=None, workers=None):
+    """Generate (or reuse) a corpus; returns its manifest entries (dicts with a `path`)."""
+    params = {
+        "count": count,
+        "width": width,
+        "height": height,
+        "formats": [f.lower().replace("jpg", "jpeg") for f in formats],
+        "size_mb": list(size_mb) if isinstance(size_mb, (list, tuple)) else
+                   [size_mb, size_mb] if size_mb else None,
+        "seed": seed,
+        "gps_center": list(gps_center),
+        "gps_spread": gps_spread,
+        "start_time": start_time,
+        "noise": noise,
+    }
+    unknown = set(params["formats"]) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported formats: {sorted(unknown)}")
+
+    directory = os.path.join(cache_dir or CORPUS_DIR, corpus_key(params))
+    manifest_path = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            return json.load(f)["images"]
+
+    # xdist workers asking for the same corpus: one generates, the others
+    # wait and then read its manifest
+    with file_lock(directory + ".lock"):
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                return json.load(f)["images"]
+        os.makedirs(directory, exist_ok=True)
+        # NumPy and Pillow's encoders release the GIL, so threads scale here
+        with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as pool:
+            images = list(pool.map(lambda i: _generate_one(i, directory, params), range(count)))
+
+        # Written last: a manifest means the corpus is complete
+        tmp = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"params": params, "images": images}, f, indent=2)
+        os.replace(tmp, manifest_path)
+    return images
+
+
+def corpus_paths(count, **kwargs):
+    return [image["path"] for image in generate_corpus(count, **kwargs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a cached synthetic photo corpus")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--formats", default="jpeg", help="Comma-separated: jpeg,png,webp")
+    parser.add_argument("--size-mb", type=float, nargs=2, metavar=("MIN", "MAX"),
+                        help="Target file size range")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    images = generate_corpus(args.count, args.width, args.height, args.formats.split(","),
+                             args.size_mb, args.seed, cache_dir=args.cache_dir)
+    total = sum(image["bytes"] for image in images)
+    print(f"{len(images)} images, {total / 1024 / 1024:.1f} MB in "
+          f"{time.perf_counter() - start:.1f}s: {os.path.dirname(images[0]['path'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
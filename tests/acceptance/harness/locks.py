@@ -0,0 +1,24 @@
+"""
+Cross-process file locks for state shared by pytest-xdist workers.
+
+    with file_lock(os.path.join(STATE_DIR, "emulator.lock")):
+        ...   # one worker at a time
+
+POSIX only (fcntl.flock), like the rest of the harness's process handling.
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` (created if missing) for the block."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
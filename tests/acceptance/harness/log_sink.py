@@ -0,0 +1,153 @@
+"""
+Bounded console / page error / network log capture.
+
+Filters at ingestion (minimum level, include/exclude regexes), keeps the
+newest `capacity` records in a ring buffer, optionally spills evicted
+records to gzip-compressed NDJSON, and counts every message per
+(source, category, level) whether it was kept or not:
+
+    logs = LogSink(capacity=500, min_level="info", include=r"upload|compress",
+                   spill_path="artifacts/x/console.ndjson.gz").attach(page)
+    ...
+    logs.records(level="error")      # newest records, as dicts
+    logs.summary()                   # counters, kept / dropped / spilled
+    logs.close()                     # writes the ring to the spill file too
+
+Records: t (epoch ms), source (console/pageerror/network), category,
+level (debug/info/warning/error), text, and url/method/status for network.
+Successful responses are "debug", 4xx "warning", 5xx and failed requests
+"error", so the default info level drops routine network traffic but
+still counts it. Categories come from regexes over the URL (network) or
+text (console); the first match wins, otherwise "app".
+"""
+
+import gzip
+import json
+import re
+import time
+from collections import Counter, deque
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+CONSOLE_LEVELS = {
+    "debug": "debug", "trace": "debug",
+    "warning": "warning",
+    "error": "error", "assert": "error",
+}
+
+CATEGORIES = {
+    "firestore": r"firestore|Firestore",
+    "auth": r"identitytoolkit|securetoken|auth/|Auth",
+    "maps": r"maps\.googleapis|maps\.gstatic|Google Maps",
+    "cloudinary": r"cloudinary",
+    "upload": r"[Uu]pload|[Cc]ompress",
+}
+
+
+class LogSink:
+    """Filtered, fixed-size log of one or more pages/contexts."""
+
+    def __init__(self, capacity=1000, min_level="info", include=None, exclude=None,
+                 categories=None, spill_path=None):
+        self.capacity = capacity
+        self.min_level = LEVELS[min_level]
+        self.include = re.compile(include) if include else None
+        self.exclude = re.compile(exclude) if exclude else None
+        self.categories = [(name, re.compile(pattern)) for name, pattern in (categories or CATEGORIES).items()]
+        self.spill_path = spill_path
+        self.counters = Counter()
+        self.dropped = 0
+        self.spilled = 0
+        self._ring = deque()
+        self._spill = None
+        self._closed = False
+
+    # ---- sources -----------------------------------------------------------
+
+    def attach(self, target):
+        """Capture from a Page or a BrowserContext (all its pages)."""
+        target.on("console", self._on_console)
+        target.on("response", self._on_response)
+        target.on("requestfailed", self._on_request_failed)
+        if hasattr(target, "main_frame"):
+            target.on("pageerror", lambda error: self.add("pageerror", "error", str(error)))
+        else:
+            target.on("weberror", lambda web_error: self.add("pageerror", "error", str(web_error.error)))
+        return self
+
+    def _on_console(self, msg):
+        self.add("console", CONSOLE_LEVELS.get(msg.type, "info"), msg.text)
+
+    def _on_response(self, response):
+        status = response.status
+        level = "error" if status >= 500 else "warning" if status >= 400 else "debug"
+        request = response.request
+        self.add("network", level, f"{request.method} {response.url} -> {status}", match=response.url,
+                 url=response.url, method=request.method, status=status)
+
+    def _on_request_failed(self, request):
+        self.add("network", "error", f"{request.method} {request.url} failed: {request.failure}",
+                 match=request.url, url=request.url, method=request.method, status=None)
+
+    # ---- ingestion ---------------------------------------------------------
+
+    def category(self, text):
+        return next((name for name, pattern in self.categories if pattern.search(text)), "app")
+
+    def add(self, source, level, text, match=None, **fields):
+        """Count a message and keep it if it passes the filters; returns whether it was kept."""
+        category = self.category(match or text)
+        self.counters[(source, category, level)] += 1
+        if (LEVELS[level] < self.min_level
+                or (self.include and not self.include.search(text))
+                or (self.exclude and self.exclude.search(text))):
+            self.dropped += 1
+            return False
+        if len(self._ring) >= self.capacity:
+            self._write(self._ring.popleft())
+            self.spilled += 1
+        self._ring.append({"t": round(time.time() * 1000), "source": source, "category": category,
+                           "level": level, "text": text, **fields})
+        return True
+
+    def _write(self, record):
+        if not self.spill_path:
+            return
+        if self._spill is None:
+            self._spill = gzip.open(self.spill_path, "wt", encoding="utf-8")
+        self._spill.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # ---- reading -----------------------------------------------------------
+
+    def records(self, source=None, category=None, level=None, pattern=None):
+        """Kept records (oldest first), optionally filtered; `level` is a minimum."""
+        regex = re.compile(pattern) if pattern else None
+        return [
+            r for r in self._ring
+            if (source is None or r["source"] == source)
+            and (category is None or r["category"] == category)
+            and (level is None or LEVELS[r["level"]] >= LEVELS[level])
+            and (regex is None or regex.search(r["text"]))
+        ]
+
+    def lines(self, **filters):
+        return [f"[{r['level']}] {r['text']}" for r in self.records(**filters)]
+
+    def summary(self):
+        return {
+            "counts": {".".join(key): count for key, count in sorted(self.counters.items())},
+            "kept": len(self._ring),
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+        }
+
+    def close(self):
+        """Append the ring to the spill file (if any), so it holds every kept record."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.spill_path:
+            for record in self._ring:
+                self._write(record)
+        if self._spill:
+            self._spill.close()
+            self._spill = None
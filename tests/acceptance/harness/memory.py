@@ -0,0 +1,117 @@
+"""
+Memory sampling over CDP for leak soak tests.
+
+    memory = MemorySampler(page)              # after page.add_init_script(OBJECT_URLS_INIT_JS)
+    for cycle in range(300):
+        ...
+        memory.sample(cycle)                  # forced GC first, then the counters
+    report = memory.growth(warmup=20)         # least-squares slope per metric
+    memory.detach()
+
+Each sample holds, after HeapProfiler.collectGarbage:
+
+    heap_used     Runtime.getHeapUsage usedSize (bytes of live JS heap)
+    nodes         Memory.getDOMCounters: DOM nodes kept alive, attached or not
+    listeners     Memory.getDOMCounters: JS event listeners
+    blobs         live Blob/File objects (Runtime.queryObjects on Blob.prototype)
+    object_urls   blob: URLs created and not yet revoked on the main thread
+
+A blob: URL keeps its Blob's bytes alive in the browser until it is
+revoked, even after the JS object is gone, so object_urls is counted
+separately: OBJECT_URLS_INIT_JS wraps URL.createObjectURL/revokeObjectURL
+before the app loads. URLs created inside workers are not seen.
+
+Chromium only.
+"""
+
+from harness.stats import linear_fit
+
+OBJECT_URLS_INIT_JS = """
+(() => {
+    const live = new Set();
+    const create = URL.createObjectURL.bind(URL);
+    const revoke = URL.revokeObjectURL.bind(URL);
+    URL.createObjectURL = object => {
+        const url = create(object);
+        live.add(url);
+        return url;
+    };
+    URL.revokeObjectURL = url => {
+        live.delete(url);
+        revoke(url);
+    };
+    window.__liveObjectURLs = () => live.size;
+})();
+"""
+
+METRICS = ("heap_used", "nodes", "listeners", "blobs", "object_urls")
+OBJECT_GROUP = "memory-sampler"
+
+
+class MemorySampler:
+    def __init__(self, page):
+        self.page = page
+        self.samples = []
+        self._session = page.context.new_cdp_session(page)
+
+    def _send(self, method, params=None):
+        return self._session.send(method, params or {})
+
+    def count_instances(self, constructor):
+        """Live objects with `constructor`.prototype in their chain (subclasses included)."""
+        try:
+            prototype = self._send("Runtime.evaluate", {
+                "expression": f"{constructor}.prototype", "objectGroup": OBJECT_GROUP,
+            })["result"]["objectId"]
+            objects = self._send("Runtime.queryObjects", {
+                "prototypeObjectId": prototype, "objectGroup": OBJECT_GROUP,
+            })["objects"]["objectId"]
+            return self._send("Runtime.callFunctionOn", {
+                "functionDeclaration": "function() { return this.length; }",
+                "objectId": objects,
+                "returnByValue": True,
+            })["result"]["value"]
+        finally:
+            self._send("Runtime.releaseObjectGroup", {"objectGroup": OBJECT_GROUP})
+
+    def sample(self, cycle):
+        """Force a GC and record the counters as of `cycle`."""
+        self._send("HeapProfiler.collectGarbage")
+        heap = self._send("Runtime.getHeapUsage")
+        dom = self._send("Memory.getDOMCounters")
+        sample = {
+            "cycle": cycle,
+            "heap_used": heap["usedSize"],
+            "heap_total": heap["totalSize"],
+            "nodes": dom["nodes"],
+            "listeners": dom["jsEventListeners"],
+            "documents": dom["documents"],
+            "blobs": self.count_instances("Blob"),
+            "object_urls": self.page.evaluate("() => window.__liveObjectURLs ? window.__liveObjectURLs() : null"),
+        }
+        self.samples.append(sample)
+        return sample
+
+    def growth(self, warmup=0):
+        """{metric: {slope (per cycle), intercept, r2, first, last}} over samples after `warmup` cycles."""
+        samples = [s for s in self.samples if s["cycle"] >= warmup] or self.samples
+        report = {}
+        for metric in METRICS:
+            points = [(s["cycle"], s[metric]) for s in samples if s[metric] is not None]
+            if not points:
+                continue
+            fit = linear_fit(*zip(*points))
+            report[metric] = {
+                "slope": round(fit["slope"], 3),
+                "intercept": round(fit["intercept"], 1),
+                "r2": round(fit["r2"], 3),
+                "first": points[0][1],
+                "last": points[-1][1],
+            }
+        return report
+
+    def detach(self):
+        try:
+            self._session.detach()
+        except Exception:
+            pass  # Page already closed
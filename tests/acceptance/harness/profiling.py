@@ -0,0 +1,145 @@
+"""
+JS CPU and heap-allocation profiling of chosen scenario steps over CDP.
+
+    profile = Profiler(page, artifact_dir)
+    with profile("photo_save"):
+        page.click("text=儲存")
+        ...
+
+writes photo_save.cpuprofile and photo_save.heapprofile (both load in
+Chrome DevTools: Performance / Memory panels, or speedscope) and prints
+the top functions by self time and by sampled allocation size.
+
+The conftest `profiler` fixture builds these per page and turns them
+into no-ops unless the run has --profile, so scenarios can mark their
+expensive steps unconditionally.
+
+Only the page's main thread is profiled. browser-image-compression runs
+compressImage() in a short-lived web worker (useWebWorker: true), so the
+worker's own compression time is not in the CPU profile; its wall time
+is in the uploadPhoto:compress measure. What the profile does show is
+the main-thread side of a save: decoding and previews, FormData, XHR
+and progress handlers, React re-renders, Firestore. Chromium only.
+"""
+
+import json
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+
+CPU_SAMPLING_US = 200
+HEAP_SAMPLING_BYTES = 32 * 1024
+# Pseudo-frames that are not main-thread work; "(program)" (native code,
+# e.g. layout) and "(garbage collector)" are kept
+IDLE_FRAMES = {"(idle)", "(root)"}
+
+
+def frame_label(call_frame):
+    name = call_frame.get("functionName") or "(anonymous)"
+    url = call_frame.get("url", "")
+    if not url:
+        return name
+    return f"{name} {url.rsplit('/', 1)[-1].split('?')[0]}:{call_frame.get('lineNumber', 0) + 1}"
+
+
+def cpu_self_times(profile):
+    """{frame label: self ms}, from samples and their time deltas."""
+    nodes = {node["id"]: node for node in profile["nodes"]}
+    totals = defaultdict(float)
+    samples, deltas = profile.get("samples", []), profile.get("timeDeltas", [])
+    # timeDeltas[i + 1] is the time spent in samples[i]
+    for i, node_id in enumerate(samples):
+        delta = deltas[i + 1] if i + 1 < len(deltas) else 0
+        totals[frame_label(nodes[node_id]["callFrame"])] += delta / 1000
+    return totals
+
+
+def heap_self_sizes(profile):
+    """{frame label: sampled bytes allocated by the frame itself}."""
+    totals = defaultdict(int)
+    stack = [profile["head"]]
+    while stack:
+        node = stack.pop()
+        totals[frame_label(node["callFrame"])] += node.get("selfSize", 0)
+        stack.extend(node.get("children", []))
+    return totals
+
+
+def top(totals, n, exclude=IDLE_FRAMES):
+    return sorted(((k, v) for k, v in totals.items() if k not in exclude and v), key=lambda kv: -kv[1])[:n]
+
+
+class Profiler:
+    """Callable: profiler(name) profiles the wrapped block of `page`."""
+
+    def __init__(self, page, out_dir, enabled=True, cpu=True, heap=True, top_n=15):
+        self.page = page
+        self.out_dir = out_dir
+        self.enabled = enabled
+        self.cpu = cpu
+        self.heap = heap
+        self.top_n = top_n
+        self.artifacts = []
+        self._session = None
+
+    def _send(self, method, params=None):
+        if self._session is None:
+            self._session = self.page.context.new_cdp_session(self.page)
+        return self._session.send(method, params or {})
+
+    @contextmanager
+    def __call__(self, name):
+        if not self.enabled:
+            yield
+            return
+        if self.cpu:
+            self._send("Profiler.enable")
+            self._send("Profiler.setSamplingInterval", {"interval": CPU_SAMPLING_US})
+            self._send("Profiler.start")
+        if self.heap:
+            self._send("HeapProfiler.enable")
+            self._send("HeapProfiler.startSampling", {
+                "samplingInterval": HEAP_SAMPLING_BYTES,
+                "includeObjectsCollectedByMajorGC": True,
+                "includeObjectsCollectedByMinorGC": True,
+            })
+        try:
+            yield
+        finally:
+            cpu = self._send("Profiler.stop")["profile"] if self.cpu else None
+            heap = self._send("HeapProfiler.stopSampling")["profile"] if self.heap else None
+            self._save(name, cpu, heap)
+
+    def _save(self, name, cpu, heap):
+        if cpu:
+            path = os.path.join(self.out_dir, f"{name}.cpuprofile")
+            with open(path, "w") as f:
+                json.dump(cpu, f)
+            self.artifacts.append(path)
+            self_times = cpu_self_times(cpu)
+            total_ms = (cpu["endTime"] - cpu["startTime"]) / 1000
+            busy_ms = sum(v for k, v in self_times.items() if k not in IDLE_FRAMES)
+            print(f"\n  CPU profile {name}: {total_ms:.0f} ms recorded, {busy_ms:.0f} ms busy on the main thread")
+            print(f"  {'self ms':>9} {'share':>6}  function")
+            for label, ms in top(self_times, self.top_n):
+                print(f"  {ms:>9.1f} {ms / max(busy_ms, 1e-9):>6.1%}  {label}")
+            print(f"  Profile: {path}")
+        if heap:
+            path = os.path.join(self.out_dir, f"{name}.heapprofile")
+            with open(path, "w") as f:
+                json.dump(heap, f)
+            self.artifacts.append(path)
+            sizes = heap_self_sizes(heap)
+            print(f"\n  Heap sampling {name}: {sum(sizes.values()) / 1024 / 1024:.1f} MB sampled allocations")
+            print(f"  {'KB':>9}  function")
+            for label, size in top(sizes, self.top_n):
+                print(f"  {size / 1024:>9.0f}  {label}")
+            print(f"  Profile: {path}")
+
+    def detach(self):
+        if self._session:
+            try:
+                self._session.detach()
+            except Exception:
+                pass  # Page already closed
+            self._session = None
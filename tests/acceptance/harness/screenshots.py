@@ -0,0 +1,148 @@
+"""
+Screenshot capture with encoding and disk writes off the scenario's path.
+
+    shots = Screenshots(artifact_dir, fmt="webp", quality=75, mode="on-failure")
+    shots(page, "3_after_save.png")      # returns right after the capture
+    ...
+    shots.close(failed=True)              # flush held frames, wait for writes
+
+The capture itself has to happen on the Playwright thread. Everything
+after it runs on a small thread pool:
+
+    jpeg   captured as JPEG by the browser at `quality`, written as is
+    png    captured as PNG, written as is
+    webp   captured as PNG, re-encoded with Pillow at `quality`
+
+A frame whose bytes hash the same as the previous frame of the same page
+is not written again; the log points at the earlier file instead.
+
+Modes: "all" writes every frame; "on-failure" keeps the last `max_frames`
+frames in memory and writes them only if close() is told the scenario
+failed; "off" captures nothing. File extensions follow the format, so
+"login.png" becomes "login.jpg" with fmt="jpeg".
+
+With `visual` (a harness.visual_diff.VisualBaselines) and `test`, every
+frame is also compared with its baseline on the pool; `visual_results`
+holds the outcomes once close() returns.
+"""
+
+import hashlib
+import io
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.tracing import span
+from harness.visual_diff import mask_rects
+
+EXTENSIONS = {"jpeg": ".jpg", "png": ".png", "webp": ".webp"}
+MODES = ("all", "on-failure", "off")
+
+
+def encode_frame(data, fmt, quality):
+    """Bytes to write for a captured frame (PNG or browser JPEG) in `fmt`."""
+    if fmt != "webp":
+        return data
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.open(io.BytesIO(data)).save(out, format="WEBP", quality=quality, method=0)
+    return out.getvalue()
+
+
+class Screenshots:
+    """Callable screenshot(page, filename) with a background encoder."""
+
+    def __init__(self, directory, fmt="jpeg", quality=80, mode="all", max_frames=50, full_page=False, workers=2,
+                 visual=None, test=None):
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {fmt}")
+        if mode not in MODES:
+            raise ValueError(f"Unknown screenshot mode: {mode}")
+        self.directory = directory
+        self.fmt = fmt
+        self.quality = quality
+        self.mode = mode
+        self.full_page = full_page
+        self.captured = 0
+        self.duplicates = 0
+        self.written = []
+        self.visual = visual
+        self.test = test
+        self.visual_results = []
+        self._held = deque(maxlen=max_frames)
+        self._last = {}  # page -> (hash, path) of its previous frame
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = []
+
+    def path_for(self, filename):
+        return os.path.join(self.directory, os.path.splitext(filename)[0] + EXTENSIONS[self.fmt])
+
+    def __call__(self, page, filename):
+        """Capture `page` now; returns the file path the frame is (or would be) written to."""
+        path = self.path_for(filename)
+        if self.mode == "off":
+            return path
+        with span(f"screenshot {filename}", cat="screenshot"):
+            masks = mask_rects(page) if self.visual else None
+            if self.fmt == "jpeg":
+                data = page.screenshot(full_page=self.full_page, type="jpeg", quality=self.quality)
+            else:
+                data = page.screenshot(full_page=self.full_page, type="png")
+        self.captured += 1
+        if self.visual:
+            self._pending.append(self._pool.submit(self._check, filename, data, masks))
+
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        previous = self._last.get(page)
+        if previous and previous[0] == digest:
+            self.duplicates += 1
+            print(f"  Screenshot: {os.path.basename(path)} unchanged since {os.path.basename(previous[1])}, skipped")
+            return previous[1]
+        self._last[page] = (digest, path)
+
+        if self.mode == "on-failure":
+            self._held.append((path, data))
+        else:
+            self._submit(path, data)
+            print(f"  Screenshot: {path}")
+        return path
+
+    def _submit(self, path, data):
+        self._pending.append(self._pool.submit(self._write, path, data))
+
+    def _write(self, path, data):
+        encoded = encode_frame(data, self.fmt, self.quality)
+        with open(path, "wb") as f:
+            f.write(encoded)
+        self.written.append((path, len(encoded)))
+
+    def _check(self, filename, data, masks):
+        result = self.visual.check(self.test, filename, data, masks, out_dir=self.directory)
+        self.visual_results.append(result)
+        if result["status"] not in ("identical", "within-tolerance"):
+            print(f"  Visual: {result['name']} {result['status']}"
+                  + (f", {result['diff_ratio']:.2%} of pixels" if "diff_ratio" in result else ""))
+
+    def visual_failures(self):
+        return [r for r in self.visual_results if r["status"] in ("different", "size-changed")]
+
+    def flush(self):
+        """Hand every held frame to the encoder."""
+        while self._held:
+            self._submit(*self._held.popleft())
+
+    def close(self, failed=False):
+        """Write held frames if the scenario failed, then wait for all writes."""
+        if failed:
+            self.flush()
+        discarded = len(self._held)
+        self._held.clear()
+        for future in self._pending:
+            future.result()
+        self._pool.shutdown()
+        if self.captured:
+            size = sum(n for _, n in self.written) / 1024
+            print(f"  Screenshots: {self.captured} captured, {self.duplicates} unchanged, "
+                  f"{len(self.written)} written ({size:.0f} KB)"
+                  + (f", {discarded} discarded (passed)" if discarded else ""))
@@ -0,0 +1,232 @@
+"""
+Large synthetic trip/place datasets for scale testing against the emulator.
+
+Builds users/{uid}/trips/{tid}/places trees shaped like a power user's
+data: places clustered around a handful of cities per trip, visitedDate
+spread over the trip's dates, tags, ratings, colors and Cloudinary-style
+photo URLs. Documents use the same fields as createTrip()/createPlace() in
+src/services/firestore.ts, and each trip's placesCount matches its places.
+
+Writes go through documents:batchWrite (500 per request) on a thread pool:
+
+    emulator = FirebaseEmulator().start()
+    summary = seed_dataset(emulator, uid, trips=100, places=100_000)
+
+or from the command line (creates the account if needed):
+
+    python tests/acceptance/harness/seed_trips.py --email power@example.com --trips 100 --places 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from harness.firebase_emulator import ID_ALPHABET, FirebaseEmulator  # noqa: E402
+
+BATCH_SIZE = 500  # Firestore's per-request write limit
+
+CITIES = [
+    ("Bangkok", 13.7563, 100.5018),
+    ("Chiang Mai", 18.7883, 98.9853),
+    ("Taipei", 25.0330, 121.5654),
+    ("Tainan", 22.9999, 120.2270),
+    ("Tokyo", 35.6762, 139.6503),
+    ("Kyoto", 35.0116, 135.7681),
+    ("Osaka", 34.6937, 135.5023),
+    ("Seoul", 37.5665, 126.9780),
+    ("Hong Kong", 22.3193, 114.1694),
+    ("Singapore", 1.3521, 103.8198),
+    ("Hanoi", 21.0278, 105.8342),
+    ("Bali", -8.4095, 115.1889),
+    ("Paris", 48.8566, 2.3522),
+    ("Barcelona", 41.3874, 2.1686),
+    ("Rome", 41.9028, 12.4964),
+    ("London", 51.5072, -0.1276),
+    ("New York", 40.7128, -74.0060),
+    ("San Francisco", 37.7749, -122.4194),
+    ("Sydney", -33.8688, 151.2093),
+    ("Reykjavik", 64.1466, -21.9426),
+]
+PLACE_KINDS = ["Cafe", "Temple", "Market", "Museum", "Park", "Bar", "Viewpoint", "Hotel", "Noodle shop", "Gallery"]
+TAGS = ["food", "coffee", "nature", "history", "nightlife", "shopping", "art", "hidden gem", "family", "sunset"]
+# src/utils/colors.ts PLACE_COLORS
+COLORS = ["#3B82F6", "#EF4444", "#10B981", "#8B5CF6", "#F59E0B", "#EAB308"]
+PHOTO_BASE_URL = "https://res.cloudinary.com/dujupddme/image/upload"
+RATINGS = [3.0, 3.5, 4.0, 4.5, 5.0]
+KM_PER_DEGREE = 111.0
+
+
+def split_evenly(total, parts, rng):
+    """Random but non-degenerate split of `total` into `parts` positive-ish counts."""
+    if parts <= 0:
+        if total:
+            raise ValueError(f"Cannot split {total} places over {parts} trips")
+        return []
+    weights = [rng.uniform(0.5, 1.5) for _ in range(parts)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for i in range(total - sum(counts)):
+        counts[i % parts] += 1
+    return counts
+
+
+def _id(rng):
+    return "".join(rng.choices(ID_ALPHABET, k=20))
+
+
+def _timestamp(dt):
+    return {"timestampValue": dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+
+
+def _strings(values):
+    return {"arrayValue": {"values": [{"stringValue": v} for v in values]}}
+
+
+def build_trip(uid, index, place_count, rng, photos_per_place, now):
+    """(trip_id, trip fields dict, [(place_id, REST fields)]) for one trip.
+
+    Place fields are emitted directly in Firestore's REST encoding; going
+    through to_fields() for 100k documents costs more than writing them.
+    """
+    trip_id = _id(rng)
+    cities = rng.sample(CITIES, k=rng.randint(1, 4))
+    start = now - timedelta(days=rng.randint(30, 3650))
+    days = rng.randint(2, 21)
+    trip = {
+        "title": f"{' / '.join(c[0] for c in cities)} {start.year}",
+        "description": f"Synthetic trip #{index}",
+        "startDate": start,
+        "endDate": start + timedelta(days=days),
+        "coverImage": None,
+        "placesCount": place_count,
+        # Distinct createdAt so getTrips' orderBy('createdAt', 'desc') is stable
+        "createdAt": now - timedelta(minutes=index),
+        "updatedAt": now - timedelta(minutes=index),
+    }
+
+    # Clustered coordinates: a few hotspots per city, Gaussian spread in km
+    hotspots = [
+        (lat + rng.gauss(0, 3) / KM_PER_DEGREE, lng + rng.gauss(0, 3) / KM_PER_DEGREE, rng.uniform(0.2, 1.5))
+        for _, lat, lng in cities for _ in range(rng.randint(2, 6))
+    ]
+    trip_value = {"stringValue": trip_id}
+    empty = {"stringValue": ""}
+    places = []
+    for n in range(place_count):
+        lat, lng, spread_km = rng.choice(hotspots)
+        lat = max(-90.0, min(90.0, lat + rng.gauss(0, spread_km) / KM_PER_DEGREE))
+        lng = ((lng + rng.gauss(0, spread_km) / KM_PER_DEGREE + 180) % 360) - 180
+        visited = start + timedelta(seconds=rng.uniform(0, days * 86400))
+        visited_value = _timestamp(visited)
+        place_id = _id(rng)
+        folder = f"{PHOTO_BASE_URL}/v{int(visited.timestamp())}/traveldot/{uid}/{trip_id}/{place_id}"
+        photos = [
+            {"mapValue": {"fields": {
+                "type": {"stringValue": "photo"},
+                "url": {"stringValue": f"{folder}_{p}.jpg"},
+                "timestamp": visited_value,
+            }}}
+            for p in range(rng.randint(*photos_per_place))
+        ]
+        places.append((place_id, {
+            "tripId": trip_value,
+            "name": {"stringValue": f"{rng.choice(PLACE_KINDS)} {n + 1}"},
+            "coordinates": {"mapValue": {"fields": {
+                "lat": {"doubleValue": round(lat, 6)},
+                "lng": {"doubleValue": round(lng, 6)},
+            }}},
+            "address": empty,
+            "visitedDate": visited_value,
+            "content": {"mapValue": {"fields": {
+                "text": {"stringValue": f"Memory #{n + 1}"},
+                "media": {"arrayValue": {"values": photos}},
+            }}},
+            "tags": _strings(rng.sample(TAGS, k=rng.randint(0, 3))),
+            "rating": {"doubleValue": rng.choice(RATINGS)},
+            "color": {"stringValue": rng.choice(COLORS)},
+            "isPublic": {"booleanValue": rng.random() < 0.1},
+            "createdAt": visited_value,
+            "updatedAt": visited_value,
+        }))
+    return trip_id, trip, places
+
+
+def seed_dataset(emulator, uid, trips=10, places=1000, seed=0, photos_per_place=(0, 4),
+                 concurrency=16, clear=True):
+    """Write `trips` trips holding `places` places in total; returns a summary dict.
+
+    Batches are submitted as soon as they fill, so building documents
+    overlaps with the emulator applying earlier batches.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    if clear:
+        emulator.clear_user_data(uid)
+
+    prefix = emulator.document_name(f"users/{uid}/trips/")
+    trip_ids, futures, batch, writes = [], [], [], 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index, count in enumerate(split_evenly(places, trips, rng)):
+            trip_id, trip, trip_places = build_trip(uid, index, count, rng, photos_per_place, now)
+            trip_ids.append(trip_id)
+            batch.append(emulator.update_write(f"users/{uid}/trips/{trip_id}", trip))
+            place_prefix = f"{prefix}{trip_id}/places/"
+            for place_id, fields in trip_places:
+                batch.append({"update": {"name": place_prefix + place_id, "fields": fields}})
+                if len(batch) == BATCH_SIZE:
+                    futures.append(pool.submit(emulator.batch_write, batch))
+                    writes += len(batch)
+                    batch = []
+        if batch:
+            futures.append(pool.submit(emulator.batch_write, batch))
+            writes += len(batch)
+        built = time.perf_counter()
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "uid": uid,
+        "trips": trips,
+        "places": places,
+        "trip_ids": trip_ids,
+        "writes": writes,
+        "batches": len(futures),
+        "build_s": round(built - start, 2),
+        "total_s": round(elapsed, 2),
+        "writes_per_s": round(writes / elapsed) if elapsed else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a large synthetic dataset into the Firestore emulator")
+    parser.add_argument("--email", required=True, help="Account to seed (created in the Auth emulator if missing)")
+    parser.add_argument("--password", default="Test1234!")
+    parser.add_argument("--trips", type=int, default=100)
+    parser.add_argument("--places", type=int, default=10000, help="Total places across all trips")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--keep", action="store_true", help="Do not clear the account's existing trips first")
+    args = parser.parse_args()
+
+    emulator = FirebaseEmulator()
+    if not emulator.is_running():
+        print("Firebase emulators are not running (firebase emulators:start --only auth,firestore)")
+        return 1
+    uid = emulator.ensure_user(args.email, args.password)
+    summary = seed_dataset(emulator, uid, args.trips, args.places, args.seed,
+                           concurrency=args.concurrency, clear=not args.keep)
+    print(f"Seeded {summary['trips']} trips / {summary['places']} places for {args.email} ({uid}) "
+          f"in {summary['total_s']}s ({summary['writes_per_s']} writes/s, {summary['batches']} batches)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Small statistics helpers for the benchmark scenarios (no NumPy needed).
+"""
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (same as numpy's default), None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values, digits=1):
+    """{count, p50, p95, max, mean} of a list of numbers."""
+    values = list(values)
+    if not values:
+        return {"count": 0, "p50": None, "p95": None, "max": None, "mean": None}
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), digits),
+        "p95": round(percentile(values, 95), digits),
+        "max": round(max(values), digits),
+        "mean": round(sum(values) / len(values), digits),
+    }
+
+
+def linear_fit(xs, ys):
+    """Least-squares line through (xs, ys): {slope, intercept, r2}."""
+    xs, ys = list(xs), list(ys)
+    n = len(xs)
+    if n < 2:
+        return {"slope": 0.0, "intercept": ys[0] if ys else 0.0, "r2": 0.0}
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    slope = sxy / sxx if sxx else 0.0
+    r2 = (sxy * sxy) / (sxx * syy) if sxx and syy else 0.0
+    return {"slope": slope, "intercept": mean_y - slope * mean_x, "r2": r2}
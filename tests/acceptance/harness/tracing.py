@@ -0,0 +1,157 @@
+"""
+Step / span timing for the acceptance scenarios, exported as a Chrome trace.
+
+    tracer = Tracer("test_photo_upload").activate()
+    tracer.step("[Step 2] 等待地圖...")        # sequential step: ends the previous one
+    with span("fill form"):                   # nested span, or @span("...") on a function
+        ...
+    tracer.finish()
+    tracer.write("trace.json")                 # open in chrome://tracing or ui.perfetto.dev
+    print(tracer.summary())
+
+The conftest `trace` fixture does the activate/finish/write part for every
+test (artifacts/<test>/trace.json) and prints the slowest steps.
+
+Categories: "step" for scenario steps and spans, "wait" for the
+condition waits in harness/waits.py, and "screenshot" for captures. For
+every span, wait_ms is the time spent in waits below it, and action_ms
+is the rest: Playwright actions plus test code.
+
+span() and traced() are no-ops while no tracer is active, so harness
+helpers can be instrumented unconditionally.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_active = None
+
+
+def current():
+    return _active
+
+
+@contextmanager
+def span(name, cat="step", **args):
+    """Record `name` on the active tracer (if any); also works as a decorator."""
+    tracer = _active
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, cat, **args) as record:
+        yield record
+
+
+def traced(name=None, cat="step"):
+    """Decorator: record each call of the function as a span."""
+    def decorate(func):
+        return span(name or func.__name__, cat)(func)
+    return decorate
+
+
+class Tracer:
+    def __init__(self, name="trace"):
+        self.name = name
+        self.spans = []
+        self._t0 = time.perf_counter()
+        self._end = None
+        self._stacks = {}  # thread id -> open spans
+        self._step = None
+        self._threads = {}
+
+    def activate(self):
+        global _active
+        _active = self
+        return self
+
+    def _stack(self):
+        return self._stacks.setdefault(threading.get_ident(), [])
+
+    def _tid(self):
+        return self._threads.setdefault(threading.get_ident(), len(self._threads) + 1)
+
+    @contextmanager
+    def span(self, name, cat="step", **args):
+        stack = self._stack()
+        record = {
+            "name": name, "cat": cat, "args": args, "tid": self._tid(), "depth": len(stack),
+            "parent": stack[-1] if stack else None, "start": time.perf_counter(), "wait": 0.0,
+        }
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            record["end"] = time.perf_counter()
+            stack.remove(record)
+            if cat == "wait":
+                parent = record["parent"]
+                while parent:
+                    parent["wait"] += record["end"] - record["start"]
+                    parent = parent["parent"]
+            self.spans.append(record)
+
+    def step(self, name):
+        """Start a sequential top-level step, ending the previous one."""
+        self.end_step()
+        print(f"\n{name}")
+        self._step = self.span(name, "step")
+        self._step.__enter__()
+
+    def end_step(self):
+        if self._step:
+            step, self._step = self._step, None
+            step.__exit__(None, None, None)
+
+    def finish(self):
+        """End the open step and stop being the active tracer."""
+        global _active
+        self.end_step()
+        self._end = time.perf_counter()
+        if _active is self:
+            _active = None
+
+    # ---- export --------------------------------------------------------------
+
+    def _ms(self, record):
+        return (record["end"] - record["start"]) * 1000
+
+    def events(self):
+        """Chrome Trace Event Format: complete ("X") events in microseconds."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.name}}]
+        for record in sorted(self.spans, key=lambda r: (r["start"], -r["end"])):
+            ms = self._ms(record)
+            events.append({
+                "name": record["name"],
+                "cat": record["cat"],
+                "ph": "X",
+                "ts": round((record["start"] - self._t0) * 1e6),
+                "dur": round(ms * 1000),
+                "pid": pid,
+                "tid": record["tid"],
+                "args": {**record["args"], "wait_ms": round(record["wait"] * 1000),
+                         "action_ms": round(ms - record["wait"] * 1000)},
+            })
+        return events
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.events(), "displayTimeUnit": "ms"}, f)
+        return path
+
+    def summary(self, top=10):
+        """Text table of the slowest steps with their wait/action split."""
+        total = ((self._end or time.perf_counter()) - self._t0) * 1000
+        steps = sorted((r for r in self.spans if r["cat"] == "step"), key=self._ms, reverse=True)[:top]
+        if not steps:
+            return ""
+        lines = [f"  Slowest steps of {self.name} ({total / 1000:.1f} s total):",
+                 f"  {'ms':>8} {'wait':>8} {'action':>8} {'share':>6}  step"]
+        for record in steps:
+            ms = self._ms(record)
+            lines.append(f"  {ms:>8.0f} {record['wait'] * 1000:>8.0f} {ms - record['wait'] * 1000:>8.0f} "
+                         f"{ms / total:>6.0%}  {'  ' * record['depth']}{record['name']}")
+        return "\n".join(lines)
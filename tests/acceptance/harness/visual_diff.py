@@ -0,0 +1,242 @@
+"""
+Visual regression diffing of acceptance screenshots against baselines.
+
+Images are split into 32x32 tiles. Each tile gets a 64-bit hash, computed
+for all tiles at once with NumPy (the tile's bytes as uint64 words times
+fixed odd weights, wrapping sum), so unchanged tiles are skipped after
+one vectorized comparison. Only changed tiles are diffed per pixel: a
+pixel differs when any channel moved by more than `tolerance` (0-255),
+which absorbs JPEG noise and anti-aliasing. By default a capture fails
+on any differing unmasked pixel, so a missing icon or badge is caught; a
+screen known to be noisy can allow a share of differing pixels with
+`max_diff_ratio` (--max-diff-ratio).
+
+Dynamic regions (map tiles, timestamps, anything tagged
+data-visual-mask) are masked out of both images before hashing. Their
+rectangles are taken from the page at capture time (mask_rects) and
+stored next to the baseline, so a region dynamic in either run is
+ignored.
+
+    baselines = VisualBaselines(update=False)
+    result = baselines.check("test_login", "1_login_page", png_or_jpeg_bytes,
+                             masks=mask_rects(page), out_dir=artifact_dir)
+
+Baselines live in tests/acceptance/baselines/<test>/<name>.png (override
+with ACCEPTANCE_BASELINE_DIR). The screenshot fixture does this for every
+capture with --visual and re-records them with --update-baselines. A
+failing capture leaves <name>.diff.png (heatmap over the dimmed capture)
+and <name>.actual.png in the artifact directory.
+
+Compare two files or two directories of screenshots from the command line:
+
+    python tests/acceptance/harness/visual_diff.py baselines/test_x artifacts/test_x --out /tmp/diffs
+
+Needs numpy and Pillow.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+BASELINE_DIR = os.environ.get(
+    "ACCEPTANCE_BASELINE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "baselines")
+)
+TILE = 32
+TOLERANCE = 16
+MAX_DIFF_RATIO = 0.0
+# Regions whose pixels change between runs by design
+MASK_SELECTORS = [".gm-style", "time", "[data-visual-mask]"]
+
+_WEIGHTS = np.random.default_rng(0x7D07).integers(1, 2 ** 63, TILE * TILE * 3 // 8, dtype=np.uint64) | np.uint64(1)
+
+MASK_RECTS_JS = """
+selectors => selectors.flatMap(selector => Array.from(document.querySelectorAll(selector), el => {
+    const r = el.getBoundingClientRect(), s = window.devicePixelRatio || 1;
+    return [Math.floor(r.x * s), Math.floor(r.y * s), Math.ceil(r.width * s), Math.ceil(r.height * s)];
+})).filter(([, , w, h]) => w > 0 && h > 0)
+"""
+
+
+def mask_rects(page, selectors=None):
+    """[x, y, w, h] device-pixel rectangles of the visible dynamic regions."""
+    return page.evaluate(MASK_RECTS_JS, MASK_SELECTORS if selectors is None else selectors)
+
+
+def tile_view(pixels, tile=TILE):
+    """(rows, cols, tile, tile, 3) view of an HxWx3 array, zero-padded to whole tiles."""
+    height, width, _ = pixels.shape
+    pad_h, pad_w = -height % tile, -width % tile
+    if pad_h or pad_w:
+        pixels = np.pad(pixels, ((0, pad_h), (0, pad_w), (0, 0)))
+    rows, cols = pixels.shape[0] // tile, pixels.shape[1] // tile
+    return pixels.reshape(rows, tile, cols, tile, 3).swapaxes(1, 2)
+
+
+def tile_hashes(pixels, tile=TILE):
+    """A uint64 hash per tile, as a (rows, cols) array."""
+    tiles = np.ascontiguousarray(tile_view(pixels, tile))
+    flat = tiles.reshape(tiles.shape[0], tiles.shape[1], -1)
+    # Whole uint64 words per tile: zero-pad when tile * tile * 3 is not a multiple of 8
+    if flat.shape[-1] % 8:
+        flat = np.pad(flat, ((0, 0), (0, 0), (0, -flat.shape[-1] % 8)))
+    words = flat.view(np.uint64)
+    weights = _WEIGHTS if tile == TILE else np.resize(_WEIGHTS, words.shape[-1]) | np.uint64(1)
+    return (words * weights).sum(axis=-1, dtype=np.uint64)
+
+
+def mask_array(shape, masks):
+    """Boolean HxW array, True inside any of the [x, y, w, h] rectangles."""
+    mask = np.zeros(shape[:2], dtype=bool)
+    for x, y, w, h in masks:
+        mask[max(y, 0):max(y + h, 0), max(x, 0):max(x + w, 0)] = True
+    return mask
+
+
+def compare(baseline, current, tolerance=TOLERANCE, masks=(), tile=TILE, max_diff_ratio=MAX_DIFF_RATIO):
+    """Compare two PIL images; returns (result dict, per-pixel delta map or None)."""
+    start = time.perf_counter()
+    a = np.asarray(baseline.convert("RGB"))
+    b = np.asarray(current.convert("RGB"))
+    if a.shape != b.shape:
+        return {"status": "size-changed", "baseline_size": list(baseline.size), "size": list(current.size),
+                "ms": round((time.perf_counter() - start) * 1000, 1)}, None
+
+    mask = mask_array(a.shape, masks)
+    if mask.any():
+        a, b = a.copy(), b.copy()
+        a[mask] = b[mask] = 0
+    changed = tile_hashes(a, tile) != tile_hashes(b, tile)
+    unmasked = a.shape[0] * a.shape[1] - int(mask.sum())
+    result = {"tiles": int(changed.size), "changed_tiles": int(changed.sum()), "diff_pixels": 0,
+              "diff_ratio": 0.0, "max_delta": 0, "bbox": None}
+    delta_map = None
+    if changed.any():
+        delta = np.abs(tile_view(a, tile)[changed].astype(np.int16) - tile_view(b, tile)[changed]).max(axis=-1)
+        full = np.zeros(changed.shape + (tile, tile), dtype=np.uint8)
+        full[changed] = delta
+        height, width = a.shape[:2]
+        delta_map = full.swapaxes(1, 2).reshape(changed.shape[0] * tile, changed.shape[1] * tile)[:height, :width]
+        over = delta_map > tolerance
+        result["diff_pixels"] = int(over.sum())
+        result["diff_ratio"] = round(result["diff_pixels"] / max(unmasked, 1), 6)
+        result["max_delta"] = int(delta.max())
+        if result["diff_pixels"]:
+            ys, xs = np.nonzero(over.any(axis=1)), np.nonzero(over.any(axis=0))
+            result["bbox"] = [int(xs[0][0]), int(ys[0][0]), int(xs[0][-1]) + 1, int(ys[0][-1]) + 1]
+
+    if not result["changed_tiles"]:
+        result["status"] = "identical"
+    elif result["diff_pixels"] <= max_diff_ratio * unmasked:
+        result["status"] = "within-tolerance"
+    else:
+        result["status"] = "different"
+    result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result, delta_map
+
+
+def heatmap(current, delta_map, tolerance=TOLERANCE):
+    """The capture dimmed to grey with differing pixels in red (brighter = larger change)."""
+    grey = (np.asarray(current.convert("L"), dtype=np.float32) * 0.35).astype(np.uint8)
+    out = np.stack([grey, grey, grey], axis=-1)
+    hot = delta_map > tolerance
+    out[hot, 0] = 128 + delta_map[hot] // 2
+    out[hot, 1:] = 0
+    return Image.fromarray(out, "RGB")
+
+
+class VisualBaselines:
+    """Baseline store: check() compares a capture, or records it with update=True."""
+
+    def __init__(self, root=BASELINE_DIR, update=False, tolerance=TOLERANCE, max_diff_ratio=MAX_DIFF_RATIO,
+                 tile=TILE):
+        self.root = root
+        self.update = update
+        self.tolerance = tolerance
+        self.max_diff_ratio = max_diff_ratio
+        self.tile = tile
+
+    def path(self, test, name):
+        return os.path.join(self.root, test, os.path.splitext(name)[0] + ".png")
+
+    def check(self, test, name, data, masks=(), out_dir=None):
+        """Compare encoded image bytes with the baseline; returns the result dict."""
+        name = os.path.splitext(name)[0]
+        path = self.path(test, name)
+        masks_path = path[:-4] + ".masks.json"
+        current = Image.open(io.BytesIO(data)).convert("RGB")
+
+        if self.update or not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            current.save(path, format="PNG", optimize=False, compress_level=6)
+            with open(masks_path, "w") as f:
+                json.dump([list(m) for m in masks], f)
+            return {"name": name, "status": "updated" if self.update else "new", "baseline": path}
+
+        stored_masks = []
+        if os.path.exists(masks_path):
+            with open(masks_path) as f:
+                stored_masks = [tuple(m) for m in json.load(f)]
+        with Image.open(path) as baseline:
+            result, delta_map = compare(baseline, current, self.tolerance, list(masks) + stored_masks,
+                                        self.tile, self.max_diff_ratio)
+        result = {"name": name, **result, "baseline": path}
+        if result["status"] in ("different", "size-changed") and out_dir:
+            current.save(os.path.join(out_dir, f"{name}.actual.png"))
+            if delta_map is not None:
+                heatmap_path = os.path.join(out_dir, f"{name}.diff.png")
+                heatmap(current, delta_map, self.tolerance).save(heatmap_path)
+                result["heatmap"] = heatmap_path
+        return result
+
+
+def _pairs(baseline, current):
+    if os.path.isfile(baseline):
+        return [(baseline, current)]
+    names = {os.path.splitext(n)[0]: n for n in os.listdir(current) if n.lower().endswith((".png", ".jpg", ".webp"))}
+    return [
+        (os.path.join(baseline, n), os.path.join(current, names[os.path.splitext(n)[0]]))
+        for n in sorted(os.listdir(baseline))
+        if n.endswith(".png") and os.path.splitext(n)[0] in names
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff screenshots against baselines")
+    parser.add_argument("baseline", help="Baseline image or directory")
+    parser.add_argument("current", help="Current image or directory (matched by file name stem)")
+    parser.add_argument("--tolerance", type=int, default=TOLERANCE)
+    parser.add_argument("--max-diff-ratio", type=float, default=MAX_DIFF_RATIO)
+    parser.add_argument("--mask", action="append", default=[], metavar="X,Y,W,H")
+    parser.add_argument("--out", help="Directory for diff heatmaps")
+    args = parser.parse_args()
+
+    masks = [tuple(int(v) for v in m.split(",")) for m in args.mask]
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    failed = 0
+    for baseline_path, current_path in _pairs(args.baseline, args.current):
+        stored_masks = []
+        if os.path.exists(baseline_path[:-4] + ".masks.json"):
+            with open(baseline_path[:-4] + ".masks.json") as f:
+                stored_masks = [tuple(m) for m in json.load(f)]
+        with Image.open(baseline_path) as baseline, Image.open(current_path) as current:
+            result, delta_map = compare(baseline, current, args.tolerance, masks + stored_masks,
+                                        max_diff_ratio=args.max_diff_ratio)
+            if args.out and delta_map is not None and result["status"] == "different":
+                stem = os.path.splitext(os.path.basename(current_path))[0]
+                heatmap(current, delta_map, args.tolerance).save(os.path.join(args.out, f"{stem}.diff.png"))
+        failed += result["status"] in ("different", "size-changed")
+        print(f"  {result['status']:<16} {os.path.basename(current_path)}: "
+              f"{result.get('changed_tiles', '-')}/{result.get('tiles', '-')} tiles, "
+              f"{result.get('diff_pixels', '-')} px, {result['ms']} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
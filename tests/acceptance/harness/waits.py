@@ -0,0 +1,120 @@
+"""
+Condition-based waits for the acceptance scenarios.
+
+Every helper returns as soon as its condition holds (instead of sleeping a
+fixed amount) and logs how long it actually waited, e.g.
+
+    [wait] auth completion: 1840 ms
+
+Timeouts are in milliseconds, like Playwright's own. On timeout the
+Playwright TimeoutError is re-raised after logging, so callers keep the
+usual try/except control flow.
+"""
+
+import time
+from contextlib import contextmanager
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from harness.tracing import span
+
+DEFAULT_TIMEOUT = 15000
+
+# Google Maps container; present once the map for the current trip has rendered
+MAP_SELECTOR = ".gm-style"
+# PlaceEditor renders its title input with this placeholder while it is open
+EDITOR_OPEN_SELECTOR = 'input[placeholder="地點名稱"]'
+# Older editor layouts used an <h2> title instead
+EDITOR_TITLES = ["新增地點", "編輯地點"]
+
+
+@contextmanager
+def timed_wait(label):
+    """Log how long the wrapped wait took, including when it times out."""
+    start = time.perf_counter()
+    try:
+        with span(label, cat="wait"):
+            yield
+    except PlaywrightTimeoutError:
+        print(f"  [wait] {label}: timed out after {(time.perf_counter() - start) * 1000:.0f} ms")
+        raise
+    print(f"  [wait] {label}: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def wait_until(page, expression, label, timeout=DEFAULT_TIMEOUT, arg=None):
+    """Wait until a JS predicate is truthy in the page; returns its value."""
+    with timed_wait(label):
+        return page.wait_for_function(expression, arg=arg, timeout=timeout).json_value()
+
+
+def wait_for_url(page, pattern, timeout=DEFAULT_TIMEOUT):
+    """Wait until the page URL matches a glob, regex or predicate."""
+    with timed_wait(f"url {pattern}"):
+        page.wait_for_url(pattern, timeout=timeout, wait_until="commit")
+    return page.url
+
+
+def wait_for_element(page, selector, timeout=DEFAULT_TIMEOUT, state="visible", label=None):
+    """Wait for the first element matching `selector`; returns its locator.
+
+    Use this for UI that only renders once Firestore data has arrived (place
+    list items, trip data, editor contents) instead of sleeping.
+    """
+    locator = page.locator(selector).first
+    with timed_wait(label or f"{selector} {state}"):
+        locator.wait_for(state=state, timeout=timeout)
+    return locator
+
+
+def _response_matcher(predicate):
+    if callable(predicate):
+        return predicate
+    return lambda response: predicate in response.url
+
+
+def wait_for_response(page, predicate, action=None, timeout=DEFAULT_TIMEOUT, label=None):
+    """Wait for a network response matching `predicate` (URL substring or callable).
+
+    If `action` is given it is called after the listener is in place, so a
+    response triggered by the action cannot be missed.
+    """
+    matcher = _response_matcher(predicate)
+    with timed_wait(label or f"response {predicate if isinstance(predicate, str) else 'matching predicate'}"):
+        if action is None:
+            return page.wait_for_event("response", predicate=matcher, timeout=timeout)
+        with page.expect_response(matcher, timeout=timeout) as response_info:
+            action()
+        return response_info.value
+
+
+def wait_for_modal_closed(page, timeout=DEFAULT_TIMEOUT, unless=None):
+    """Wait for the PlaceEditor modal to close.
+
+    If `unless` (a CSS selector, e.g. an error toast) shows up first the wait
+    ends early. Returns True if the modal closed, False if `unless` matched.
+    """
+    closed = wait_until(
+        page,
+        """([openSelector, titles, unless]) => {
+            const open = document.querySelector(openSelector) ||
+                Array.from(document.querySelectorAll('h2')).some(h => titles.includes(h.textContent?.trim()));
+            if (!open) return 'closed';
+            if (unless && document.querySelector(unless)) return 'unless';
+            return false;
+        }""",
+        "editor modal closed",
+        timeout=timeout,
+        arg=[EDITOR_OPEN_SELECTOR, EDITOR_TITLES, unless],
+    )
+    return closed == "closed"
+
+
+def editor_is_open(page):
+    """True if the PlaceEditor modal is currently open."""
+    if page.locator(EDITOR_OPEN_SELECTOR).count() > 0:
+        return True
+    h2_texts = page.evaluate("""
+        () => Array.from(document.querySelectorAll('h2'))
+             .map(h => h.textContent?.trim()).filter(Boolean)
+    """)
+    return any(t in EDITOR_TITLES for t in h2_texts)
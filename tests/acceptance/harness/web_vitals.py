@@ -0,0 +1,115 @@
+"""
+Startup metrics for a page load: Web Vitals plus network tallies.
+
+    tally = NetworkTally(page)             # CDP, before navigating
+    page.add_init_script(VITALS_INIT_JS)
+    page.goto(url)
+    ...wait for the route to be usable...
+    metrics = {**collect_vitals(page), **tally.snapshot()}
+
+Vitals come from PerformanceObservers installed before any app code runs:
+TTFB (navigation responseStart), FCP, LCP (last candidate before the
+snapshot), and total blocking time, i.e. the sum of (longtask - 50 ms) after
+FCP. Byte counts come from CDP's encodedDataLength, which unlike Resource
+Timing also covers cross-origin scripts (Google Maps) without
+Timing-Allow-Origin. Chromium only.
+
+Waiting for "networkidle" does not work for this app (Firestore keeps a
+long-poll/WebChannel open), so callers decide when the route is ready and
+snapshot at that moment.
+"""
+
+import re
+
+VITALS_INIT_JS = """
+(() => {
+    const vitals = window.__vitals = { fcp: null, lcp: null, longtasks: [] };
+    const observe = (type, handle) => {
+        try { new PerformanceObserver(list => list.getEntries().forEach(handle)).observe({ type, buffered: true }); }
+        catch (e) { /* entry type unsupported */ }
+    };
+    observe('paint', e => { if (e.name === 'first-contentful-paint') vitals.fcp = e.startTime; });
+    observe('largest-contentful-paint', e => { vitals.lcp = e.startTime; });
+    observe('longtask', e => vitals.longtasks.push([e.startTime, e.duration]));
+})();
+"""
+
+COLLECT_VITALS_JS = """
+() => {
+    const v = window.__vitals || { longtasks: [] };
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = v.fcp;
+    const tbt = fcp == null ? null : v.longtasks
+        .filter(([start]) => start >= fcp)
+        .reduce((sum, [, duration]) => sum + Math.max(0, duration - 50), 0);
+    return {
+        ttfb_ms: nav ? nav.responseStart : null,
+        fcp_ms: fcp,
+        lcp_ms: v.lcp,
+        tbt_ms: tbt,
+        longtasks: v.longtasks.length,
+        dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        now_ms: performance.now(),
+    };
+}
+"""
+
+# Request classes counted separately; first match wins
+REQUEST_CLASSES = {
+    "firestore": re.compile(r"firestore\.googleapis\.com|google\.firestore\.v1\.Firestore|:8080/"),
+    "auth": re.compile(r"identitytoolkit\.googleapis\.com|securetoken\.googleapis\.com|:9099/"),
+    "maps": re.compile(r"maps\.googleapis\.com|maps\.gstatic\.com|mapsresources-pa\.googleapis\.com"),
+}
+
+
+def collect_vitals(page):
+    return page.evaluate(COLLECT_VITALS_JS)
+
+
+class NetworkTally:
+    """Per-load request counts and transferred bytes, recorded over CDP."""
+
+    def __init__(self, page):
+        self._session = page.context.new_cdp_session(page)
+        self._requests = {}
+        self._session.on("Network.requestWillBeSent", self._on_request)
+        self._session.on("Network.responseReceived", self._on_response)
+        self._session.on("Network.loadingFinished", self._on_finished)
+        self._session.send("Network.enable")
+
+    def _on_request(self, event):
+        url = event["request"]["url"]
+        kind = next((name for name, pattern in REQUEST_CLASSES.items() if pattern.search(url)), "other")
+        self._requests[event["requestId"]] = {"url": url, "class": kind, "type": event.get("type"), "bytes": 0,
+                                              "cached": False}
+
+    def _on_response(self, event):
+        request = self._requests.get(event["requestId"])
+        if request:
+            request["type"] = event.get("type") or request["type"]
+            response = event["response"]
+            request["cached"] = bool(response.get("fromDiskCache") or response.get("fromServiceWorker"))
+
+    def _on_finished(self, event):
+        request = self._requests.get(event["requestId"])
+        if request:
+            request["bytes"] = event.get("encodedDataLength", 0)
+
+    def reset(self):
+        self._requests.clear()
+
+    def snapshot(self):
+        requests = list(self._requests.values())
+        scripts = [r for r in requests if r["type"] == "Script"]
+        counts = {f"{kind}_requests": sum(r["class"] == kind for r in requests) for kind in REQUEST_CLASSES}
+        return {
+            "requests": len(requests),
+            **counts,
+            "js_requests": len(scripts),
+            "js_bytes": sum(r["bytes"] for r in scripts),
+            "js_cached": sum(r["cached"] for r in scripts),
+            "total_bytes": sum(r["bytes"] for r in requests),
+        }
+
+    def detach(self):
+        self._session.detach()
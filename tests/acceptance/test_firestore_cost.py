@@ -0,0 +1,94 @@
+"""
+Firestore cost per user action (reads/writes/bytes), as a regression gate.
+
+Runs a few everyday actions against the emulator with
+harness/firestore_accounting.py recording the page's Firestore traffic,
+and fails when a step needs more operations than the service code in
+src/services/firestore.ts implies:
+
+    open trip map             getTrips() + subscribeToPlaces() of the latest trip
+    save place with 1 photo   updatePlace(): one merge write, echoed back once
+                              by the places listener
+    delete trip (N places)    deleteTrip(): getDocs() of every place, a batch
+                              delete and the trip delete; flagged as fan-out
+
+deleteTrip() has no UI yet, so that step calls it through the dev server's
+module graph (import('/src/services/firestore.ts')), i.e. on the same
+Firestore instance the app uses. The per-step report, including fan-out
+flags, goes to artifacts/<test>/firestore_cost.json.
+
+    pytest tests/acceptance/test_firestore_cost.py --firebase-emulator -s
+"""
+
+import json
+import os
+
+import pytest
+
+from harness.editor import open_place_editor
+from harness.firestore_accounting import FirestoreAccounting, over_budget
+from harness.image_corpus import corpus_paths
+from harness.waits import MAP_SELECTOR, wait_for_element, wait_for_modal_closed, wait_until
+
+DELETED_TRIP_PLACES = 30
+
+# Ceilings per step; raise them only together with the code change that
+# makes an action more expensive
+BUDGETS = {
+    "open trip map": {"reads": 3, "writes": 0},  # 2 trips + 1 place
+    "save place with 1 photo": {"reads": 1, "writes": 1},
+    f"delete trip ({DELETED_TRIP_PLACES} places)": {
+        "reads": DELETED_TRIP_PLACES,
+        "writes": DELETED_TRIP_PLACES + 1,
+    },
+}
+
+DELETE_TRIP_JS = """
+async ({ uid, tripId }) => {
+    const { deleteTrip } = await import('/src/services/firestore.ts');
+    await deleteTrip(uid, tripId);
+}
+"""
+
+
+@pytest.mark.ac("AC-019")
+@pytest.mark.ac("AC-020")
+@pytest.mark.ac("AC-041")
+def test_firestore_cost_per_action(firebase, authed_page, cloudinary, artifact_dir):
+    page = authed_page
+    uid = firebase.uid
+    # Trips are listed newest first, so the map opens "Cost trip"
+    doomed_trip = firebase.seed_trip(uid, "Trip to delete")
+    for i in range(DELETED_TRIP_PLACES):
+        firebase.seed_place(uid, doomed_trip, f"Place {i}", 35.0 + i / 100, 135.7)
+    trip_id = firebase.seed_trip(uid, "Cost trip")
+    firebase.seed_place(uid, trip_id, "Cost place", 13.7563, 100.5018)
+
+    accounting = FirestoreAccounting(page)
+
+    with accounting.step("open trip map"):
+        page.reload()
+        wait_for_element(page, MAP_SELECTOR, label="map")
+        wait_until(page, "() => document.querySelectorAll('gmp-advanced-marker').length > 0", "marker")
+
+    with accounting.step("save place with 1 photo"):
+        assert open_place_editor(page), "PlaceEditor could not be opened"
+        page.locator('input[type="file"]').first.set_input_files(corpus_paths(1, size_mb=3, seed=35)[0])
+        wait_for_element(page, 'img[src^="blob:"]', timeout=5000, label="photo preview")
+        page.locator("button").filter(has_text="儲存").first.click()
+        assert wait_for_modal_closed(page, timeout=30000), "PlaceEditor did not close after saving"
+
+    with accounting.step(f"delete trip ({DELETED_TRIP_PLACES} places)"):
+        page.evaluate(DELETE_TRIP_JS, {"uid": uid, "tripId": doomed_trip})
+
+    report = accounting.report()
+    accounting.detach()
+    accounting.print_report(report)
+    path = os.path.join(artifact_dir, "firestore_cost.json")
+    with open(path, "w") as f:
+        json.dump({**report, "budgets": BUDGETS}, f, indent=2)
+    print(f"  Report: {path}")
+
+    assert not firebase.list_documents(f"users/{uid}/trips/{doomed_trip}/places"), "deleteTrip left places behind"
+    problems = over_budget(report, BUDGETS)
+    assert not problems, "Firestore operations over budget:\n  " + "\n  ".join(problems)
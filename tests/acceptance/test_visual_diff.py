@@ -0,0 +1,79 @@
+"""
+harness/visual_diff.py: compare() must catch small, localized regressions.
+
+No browser needed; images are synthesized with NumPy.
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from harness.visual_diff import compare
+
+
+def screen(seed=0, width=1280, height=800):
+    """A flat page with some text-like noise, like a captured screen."""
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 245, dtype=np.uint8)
+    pixels[100:700, 200:1100] = rng.integers(0, 255, (600, 900, 3), dtype=np.uint8)
+    return pixels
+
+
+@pytest.fixture
+def baseline():
+    pixels = screen()
+    pixels[20:36, 1240:1256] = (220, 38, 38)  # a 16x16 red badge
+    return pixels
+
+
+def test_missing_badge_fails(baseline):
+    current = baseline.copy()
+    current[20:36, 1240:1256] = 245
+
+    result, delta_map = compare(Image.fromarray(baseline), Image.fromarray(current))
+
+    assert result["status"] == "different"
+    assert result["diff_pixels"] == 16 * 16
+    assert result["bbox"] == [1240, 20, 1256, 36]
+    assert delta_map is not None
+
+
+def test_single_pixel_change_fails(baseline):
+    current = baseline.copy()
+    current[400, 640] = 255 - current[400, 640]
+
+    result, _ = compare(Image.fromarray(baseline), Image.fromarray(current))
+
+    assert result["status"] == "different"
+    assert result["diff_pixels"] == 1
+
+
+def test_change_within_tolerance_passes(baseline):
+    # Anti-aliasing / JPEG-sized shifts stay under TOLERANCE
+    current = baseline.copy()
+    current[300:340, 300:400] = np.clip(current[300:340, 300:400].astype(np.int16) + 8, 0, 255)
+
+    result, _ = compare(Image.fromarray(baseline), Image.fromarray(current))
+
+    assert result["changed_tiles"] > 0
+    assert result["status"] == "within-tolerance"
+
+
+def test_masked_change_passes(baseline):
+    current = baseline.copy()
+    current[20:36, 1240:1256] = 245
+
+    result, _ = compare(Image.fromarray(baseline), Image.fromarray(current), masks=[(1232, 16, 32, 32)])
+
+    assert result["status"] in ("identical", "within-tolerance")
+
+
+def test_max_diff_ratio_is_opt_in(baseline):
+    current = baseline.copy()
+    current[20:36, 1240:1256] = 245
+
+    strict, _ = compare(Image.fromarray(baseline), Image.fromarray(current))
+    lenient, _ = compare(Image.fromarray(baseline), Image.fromarray(current), max_diff_ratio=0.001)
+
+    assert strict["status"] == "different"
+    assert lenient["status"] == "within-tolerance"